@@ -0,0 +1,242 @@
+# =============================================================================
+# BENCHMARK POR ETAPAS DEL PIPELINE ORCH-OR
+# =============================================================================
+#
+# Mide por separado la construcción del circuito, la transpilación, la
+# ejecución en AerSimulator (por método y número de shots), el vector de
+# estado con Statevector.from_instruction, el análisis de estados reducidos
+# (state_metrics) y el renderizado de figuras, para 3/5/13/20/26 qubits.
+# De cada etapa se guarda el tiempo (mínimo y mediana de --repeat) y el
+# pico de RSS del proceso durante la etapa (muestreado en un hilo, porque
+# la memoria de Aer no pasa por tracemalloc).
+#
+#   python benchmarks/stages.py -o bench.json
+#   python benchmarks/stages.py -o nuevo.json --baseline bench.json
+#
+# Con --baseline se compara cada etapa con la medición guardada y el
+# proceso termina con código 1 si alguna es más lenta que la tolerancia.
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import psutil
+import qiskit
+import qiskit_aer
+from qiskit import transpile
+from qiskit.quantum_info import Statevector
+from qiskit_aer import AerSimulator
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orch_or.figures import bloch_figure, histogram_figure  # noqa: E402
+from orch_or.microtubule import MicrotubuleLattice, build_microtubule_circuit  # noqa: E402
+from orch_or.noise import MEMORY_BUDGET  # noqa: E402
+from orch_or.statevector_metrics import state_metrics  # noqa: E402
+
+QUBITS = [3, 5, 13, 20, 26]
+METHODS = ["statevector", "density_matrix", "matrix_product_state"]
+SHOTS = [256, 2048]
+
+# Bytes por qubit de cada método (None = sin límite práctico)
+STATE_BYTES = {
+    "statevector": lambda n: 16 * 2**n,
+    "density_matrix": lambda n: 16 * 4**n,
+    "matrix_product_state": lambda n: None,
+}
+
+
+class PeakRSS:
+    """Pico de memoria residente del proceso mientras dura el bloque."""
+
+    def __init__(self, interval: float = 0.002):
+        self.interval = interval
+        self._process = psutil.Process()
+        self._stop = threading.Event()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, self._process.memory_info().rss)
+
+    def __enter__(self):
+        self.start = self.peak = self._process.memory_info().rss
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self._process.memory_info().rss)
+        self.delta = self.peak - self.start
+
+
+def measure(fn, repeat: int) -> tuple[dict, object]:
+    """Tiempos de ``repeat`` llamadas a ``fn`` y pico de RSS de la primera."""
+    times, value, peak = [], None, None
+    for i in range(repeat):
+        with PeakRSS() as rss:
+            start = time.perf_counter()
+            value = fn()
+            times.append(time.perf_counter() - start)
+        if i == 0:
+            peak = rss
+    return {
+        "times": times,
+        "min": min(times),
+        "median": statistics.median(times),
+        "peak_rss_bytes": peak.peak,
+        "peak_rss_delta_bytes": peak.delta,
+    }, value
+
+
+def bench_qubits(n: int, args, record):
+    lattice = MicrotubuleLattice(protofilaments=n)
+    stats, qc = measure(lambda: build_microtubule_circuit(lattice), args.repeat)
+    record("build", n, stats)
+
+    for method in args.methods:
+        state_bytes = STATE_BYTES[method](n)
+        if state_bytes is not None and state_bytes > args.memory_budget:
+            record("run", n, {"skipped": f"{state_bytes} bytes > presupuesto"},
+                   method=method)
+            continue
+        simulator = AerSimulator(method=method)
+        # MPS: medición diferida, sin mediciones intermedias
+        circuit = (build_microtubule_circuit(lattice, deferred=True)
+                   if method == "matrix_product_state" else qc)
+        stats, tqc = measure(lambda: transpile(circuit, simulator), args.repeat)
+        record("transpile", n, stats, method=method)
+        for shots in args.shots:
+            if n > args.max_run_qubits.get(method, n):
+                record("run", n, {"skipped": "--max-run-qubits"}, method=method, shots=shots)
+                continue
+            stats, result = measure(
+                lambda: simulator.run(tqc, shots=shots, seed_simulator=0).result(),
+                args.repeat)
+            stats["aer_time_taken"] = result.time_taken
+            stats["aer_method"] = result.results[0].metadata.get("method")
+            record("run", n, stats, method=method, shots=shots)
+
+    if 16 * 2**n > args.memory_budget:
+        return
+    unitary_part = build_microtubule_circuit(lattice, measure=False)
+    stats, state = measure(lambda: Statevector.from_instruction(unitary_part), args.repeat)
+    record("statevector", n, stats)
+    if n <= args.max_analysis_qubits:
+        stats, _ = measure(lambda: state_metrics(state), args.repeat)
+        record("analysis", n, stats)
+
+    def render(fig):
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png")
+        return buffer.tell()
+
+    probs = state.probabilities()
+    top = np.argsort(probs)[::-1][:256]
+    counts = {format(int(i), f"0{n}b"): int(probs[i] * 1e6) + 1 for i in top}
+    stats, _ = measure(lambda: render(histogram_figure(counts)), args.repeat)
+    record("render_histogram", n, stats)
+    if n <= args.max_analysis_qubits:
+        stats, _ = measure(lambda: render(bloch_figure(state)), args.repeat)
+        record("render_bloch", n, stats)
+
+
+def key(entry: dict) -> tuple:
+    return (entry["stage"], entry["qubits"], entry.get("method"), entry.get("shots"))
+
+
+def compare(results: list[dict], baseline: dict, tolerance: float,
+            min_seconds: float) -> list[dict]:
+    """Etapas cuya mediana supera la de la línea base en más de ``tolerance``."""
+    reference = {key(e): e for e in baseline["results"] if "median" in e}
+    regressions = []
+    for entry in results:
+        old = reference.get(key(entry))
+        if old is None or "median" not in entry:
+            continue
+        ratio = entry["median"] / max(old["median"], 1e-12)
+        entry["baseline_median"] = old["median"]
+        entry["ratio"] = ratio
+        if ratio > 1 + tolerance and entry["median"] - old["median"] > min_seconds:
+            regressions.append(entry)
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark por etapas del pipeline Orch-OR")
+    parser.add_argument("--qubits", type=int, nargs="+", default=QUBITS)
+    parser.add_argument("--methods", nargs="+", default=METHODS, choices=METHODS)
+    parser.add_argument("--shots", type=int, nargs="+", default=SHOTS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--memory-budget", type=int, default=MEMORY_BUDGET,
+                        help="bytes máximos del estado completo (omite la etapa si no cabe)")
+    parser.add_argument("--max-run-qubits", type=json.loads,
+                        default={"statevector": 20, "density_matrix": 10},
+                        help="JSON {método: qubits}: límite de la etapa run")
+    parser.add_argument("--max-analysis-qubits", type=int, default=20)
+    parser.add_argument("--output", "-o", default="bench.json")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="aumento relativo de la mediana tolerado (0.25)")
+    parser.add_argument("--min-seconds", type=float, default=0.005,
+                        help="diferencias absolutas menores no cuentan como regresión")
+    args = parser.parse_args(argv)
+
+    results = []
+
+    def record(stage, n, stats, **labels):
+        entry = {"stage": stage, "qubits": n, **labels, **stats}
+        results.append(entry)
+        shown = (f"{entry['median'] * 1e3:10.2f} ms  pico {entry['peak_rss_bytes'] / 2**20:8.1f} MiB"
+                 if "median" in entry else entry["skipped"])
+        print(f"{stage:<18} {n:>3} {labels.get('method') or '':<22} "
+              f"{labels.get('shots') or '':>6}  {shown}", flush=True)
+
+    for n in args.qubits:
+        bench_qubits(n, args, record)
+
+    report = {
+        "meta": {
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "qiskit": qiskit.__version__,
+            "qiskit_aer": qiskit_aer.__version__,
+            "numpy": np.__version__,
+            "args": {k: v for k, v in vars(args).items()
+                     if k not in ("output", "baseline")},
+        },
+        "results": results,
+    }
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            regressions = compare(results, json.load(fh), args.tolerance, args.min_seconds)
+        report["regressions"] = [key(e) for e in regressions]
+        for entry in regressions:
+            print(f"REGRESIÓN {key(entry)}: {entry['median'] * 1e3:.2f} ms "
+                  f"vs {entry['baseline_median'] * 1e3:.2f} ms (x{entry['ratio']:.2f})")
+        status = 1 if regressions else 0
+
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"Resultados en {args.output}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""Simulación cuántica Orch-OR de microtúbulos (Penrose-Hameroff)."""
+
+import importlib
+
+# Importación perezosa: ``import orch_or`` (y ``orch-or --help``) no carga
+# qiskit, Aer ni matplotlib hasta que se usa un nombre que los necesita.
+# Ningún nombre exportado coincide con un submódulo (``sweep`` está en
+# ``sweeps`` y ``state_metrics`` en ``statevector_metrics``), así que
+# importar un submódulo nunca tapa una función exportada ni al revés
+_EXPORTS = {
+    "ClassicalShadow": "shadows",
+    "CountsAccumulator": "counts",
+    "JobRunner": "submit",
+    "LocalRuntime": "submit",
+    "MicrotubuleLattice": "microtubule",
+    "NoiseConfig": "noise",
+    "ResultsStore": "store",
+    "SpectralCache": "spectral",
+    "Spectrum": "spectral",
+    "RingHamiltonian": "symmetry",
+    "TranspileCache": "cache",
+    "TubulinNoise": "noise",
+    "build_microtubule_circuit": "microtubule",
+    "classical_shadow": "shadows",
+    "coherence": "hamiltonian",
+    "consciousness_metrics": "analysis",
+    "decohere": "lindblad",
+    "distribution_metrics": "analysis",
+    "evolve": "hamiltonian",
+    "evolve_checkpointed": "trajectory",
+    "exact_distribution": "exact",
+    "exact_metrics": "exact",
+    "initial_state": "hamiltonian",
+    "load_trajectory": "trajectory",
+    "merge_counts": "parallel",
+    "microtubule_hamiltonian": "hamiltonian",
+    "render_figures": "figures",
+    "run_ensemble": "parallel",
+    "run_mps": "mps",
+    "run_noisy": "noise",
+    "preparation_states": "spectral",
+    "select_method": "noise",
+    "spectral_evolve": "spectral",
+    "stage_snapshots": "evolution",
+    "state_metrics": "statevector_metrics",
+    "sweep": "sweeps",
+    "symmetric_hamiltonian": "symmetry",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
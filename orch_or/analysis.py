@@ -0,0 +1,58 @@
+# =============================================================================
+# MÉTRICAS DE CONSCIENCIA A PARTIR DE LOS RESULTADOS DE MEDICIÓN
+# =============================================================================
+
+from __future__ import annotations
+
+import numpy as np
+
+from .profiling import profiled
+
+
+def entropy_label(total_patterns: int) -> str:
+    """Etiqueta de entropía cuántica usada por 13qbits.py."""
+    return 'Alta' if total_patterns > 100 else 'Media' if total_patterns > 50 else 'Baja'
+
+
+def coherence_label(total_patterns: int) -> str:
+    return 'Detectada' if total_patterns < 1000 else 'Perdida'
+
+
+@profiled("analyze")
+def consciousness_metrics(counts: dict, num_qubits: int) -> dict:
+    """Complejidad, entropía y coherencia residual de un diccionario de cuentas."""
+    total_patterns = len(counts)
+    max_possible = 2**num_qubits
+    shots = np.fromiter(counts.values(), dtype=float)
+    probs = shots / shots.sum()
+    return {
+        "patterns": total_patterns,
+        "complexity": total_patterns / max_possible * 100,
+        "shannon_entropy": float(-np.sum(probs * np.log2(probs))),
+        "entropy": entropy_label(total_patterns),
+        "coherence": coherence_label(total_patterns),
+    }
+
+
+@profiled("analyze")
+def distribution_metrics(probs, num_qubits: int, shots: int | None = None,
+                         tol: float = 1e-12) -> dict:
+    """Métricas de consciencia a partir de probabilidades exactas.
+
+    Sin ``shots`` la complejidad cuenta todos los patrones con probabilidad
+    no nula; con ``shots`` usa el número esperado de patrones distintos en
+    una muestra de ese tamaño, comparable con ``consciousness_metrics``.
+    """
+    probs = np.asarray(probs, dtype=float)
+    support = probs[probs > tol]
+    if shots is None:
+        total_patterns = len(support)
+    else:
+        total_patterns = float(np.sum(-np.expm1(shots * np.log1p(-support))))
+    return {
+        "patterns": total_patterns,
+        "complexity": total_patterns / 2**num_qubits * 100,
+        "shannon_entropy": float(-np.sum(support * np.log2(support))),
+        "entropy": entropy_label(total_patterns),
+        "coherence": coherence_label(total_patterns),
+    }
@@ -0,0 +1,179 @@
+# =============================================================================
+# CACHÉ EN DISCO DE CIRCUITOS TRANSPILADOS (QPY)
+# =============================================================================
+#
+# La clave es un hash estructural de los parámetros del constructor, del
+# backend (nombre, método y operaciones del target), del nivel de
+# optimización y de la versión de Qiskit.  Las entradas se guardan en QPY,
+# se desalojan por LRU (fecha de modificación, renovada en cada acierto)
+# cuando el directorio supera ``max_bytes``, y las más recientes se
+# mantienen además en memoria para no deserializar en ejecuciones calientes.
+# ``DiskLRU`` es la parte común con la caché de espectros de ``spectral``.
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+
+import qiskit
+from qiskit import QuantumCircuit, qpy, transpile
+
+from .microtubule import MicrotubuleLattice, build_microtubule_circuit
+
+DEFAULT_DIRECTORY = Path(os.environ.get(
+    "ORCH_OR_CACHE", Path.home() / ".cache" / "orch_or" / "transpiled"))
+
+
+def backend_fingerprint(backend) -> dict:
+    """Identidad del backend relevante para la transpilación."""
+    target = getattr(backend, "target", None)
+    options = getattr(backend, "options", None)
+    return {
+        "name": getattr(backend, "name", type(backend).__name__),
+        "method": getattr(options, "method", None),
+        "num_qubits": getattr(target, "num_qubits", None),
+        "operations": sorted(target.operation_names) if target is not None else None,
+    }
+
+
+class DiskLRU(ABC):
+    """Caché LRU en disco (y en memoria) de valores identificados por una clave.
+
+    Las subclases definen ``suffix``, ``_load(path)`` y ``_dump(value, fh)``;
+    ``_get(key, compute)`` devuelve el valor de memoria, del disco o, si
+    falta, lo calcula y lo escribe de forma atómica.
+    """
+
+    suffix = ".bin"
+
+    def __init__(self, directory, max_bytes: int, memory_entries: int):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._memory: OrderedDict[str, object] = OrderedDict()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    def _load(self, path: Path):
+        """Lee el valor guardado en ``path``."""
+
+    @abstractmethod
+    def _dump(self, value, fh):
+        """Escribe ``value`` en el archivo binario abierto ``fh``."""
+
+    def _get(self, key: str, compute):
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return self._memory[key]
+
+        path = self.directory / f"{key}{self.suffix}"
+        if path.exists():
+            value = self._load(path)
+            os.utime(path)
+            self.disk_hits += 1
+        else:
+            value = compute()
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "wb") as fh:
+                self._dump(value, fh)
+            os.replace(tmp, path)
+            self.misses += 1
+            self.evict(keep=path)
+
+        self._memory[key] = value
+        if len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+        return value
+
+    def _entries(self) -> list[Path]:
+        return sorted(self.directory.glob(f"*{self.suffix}"), key=lambda p: p.stat().st_mtime)
+
+    def evict(self, keep: Path | None = None):
+        """Borra las entradas menos usadas hasta quedar bajo ``max_bytes``.
+
+        ``keep`` (la entrada recién escrita) no se borra aunque ella sola
+        supere el límite, para que la siguiente ejecución no vuelva a fallar.
+        """
+        entries = self._entries()
+        total = sum(p.stat().st_size for p in entries)
+        for path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            total -= path.stat().st_size
+            path.unlink(missing_ok=True)
+
+    def clear(self):
+        for path in self._entries():
+            path.unlink(missing_ok=True)
+        self._memory.clear()
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "entries": len(entries),
+            "bytes": sum(p.stat().st_size for p in entries),
+        }
+
+
+class TranspileCache(DiskLRU):
+    """Caché LRU de circuitos del microtúbulo ya transpilados."""
+
+    suffix = ".qpy"
+
+    def __init__(self, directory=None, max_bytes: int = 256 * 2**20,
+                 memory_entries: int = 32):
+        super().__init__(directory if directory is not None else DEFAULT_DIRECTORY,
+                         max_bytes, memory_entries)
+
+    def _load(self, path: Path) -> QuantumCircuit:
+        with open(path, "rb") as fh:
+            return qpy.load(fh)[0]
+
+    def _dump(self, circuit: QuantumCircuit, fh):
+        qpy.dump(circuit, fh)
+
+    def key(self, lattice: MicrotubuleLattice, backend, optimization_level: int | None,
+            **build_kwargs) -> str:
+        description = {
+            "lattice": dataclasses.asdict(lattice),
+            "build": build_kwargs,
+            "backend": backend_fingerprint(backend),
+            "optimization_level": optimization_level,
+            "qiskit": qiskit.__version__,
+        }
+        # default=str: los Parameter se identifican por su nombre
+        blob = json.dumps(description, sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    def get_or_build(self, lattice: MicrotubuleLattice | None = None, backend=None,
+                     optimization_level: int | None = None,
+                     **build_kwargs) -> QuantumCircuit:
+        """Circuito transpilado para ``backend``, construyéndolo sólo si falta.
+
+        Los Parameter del circuito devuelto son copias deserializadas: hay que
+        asignarlos por nombre, no con los objetos usados al construirlo.
+        """
+        if backend is None:
+            from qiskit_aer import AerSimulator
+            backend = AerSimulator()
+        lattice = lattice if lattice is not None else MicrotubuleLattice()
+        key = self.key(lattice, backend, optimization_level, **build_kwargs)
+        return self._get(key, lambda: transpile(
+            build_microtubule_circuit(lattice, **build_kwargs), backend,
+            optimization_level=optimization_level))
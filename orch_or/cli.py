@@ -0,0 +1,253 @@
+# =============================================================================
+# INTERFAZ DE LÍNEA DE COMANDOS: orch-or simulate / sweep / analyze
+# =============================================================================
+#
+# Sólo argparse se importa al cargar el módulo; qiskit, Aer y NumPy se
+# importan dentro de cada subcomando, así que ``orch-or --help`` arranca en
+# milisegundos.  ``--json`` imprime una línea JSON por resultado para que un
+# planificador pueda leer la salida, y ``--quiet`` no imprime nada.
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+
+METHODS = ["automatic", "statevector", "density_matrix", "stabilizer",
+           "matrix_product_state", "exact", "numpy"]
+
+
+def _emit(args, summary: dict, lines: list[str]):
+    if args.quiet:
+        return
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, default=str))
+    else:
+        print("\n".join(lines))
+
+
+def _lattice(args):
+    from .microtubule import MicrotubuleLattice
+    return MicrotubuleLattice(protofilaments=args.qubits, rings=args.rings)
+
+
+def _top(counts: dict, k: int = 5) -> list:
+    import heapq
+    return heapq.nlargest(k, counts.items(), key=lambda item: item[1])
+
+
+def _simulate(args) -> int:
+    from dataclasses import asdict
+
+    from .analysis import consciousness_metrics, distribution_metrics
+    from .microtubule import build_microtubule_circuit
+    from .profiling import phase, record_aer
+
+    lattice = _lattice(args)
+    start = time.perf_counter()
+    counts, arrays = None, {}
+    if args.method == "exact":
+        import numpy as np
+
+        from .exact import exact_distribution
+        qc = build_microtubule_circuit(lattice)
+        probs = exact_distribution(qc)
+        num_bits = qc.num_clbits
+        metrics = distribution_metrics(probs, num_bits, shots=args.shots)
+        best = np.argsort(probs)[::-1][:5]
+        top = [(format(int(i), f"0{num_bits}b"), float(probs[i])) for i in best]
+        arrays["probabilities"] = probs
+    elif args.method == "numpy":
+        from .kernel import sample_counts
+        qc = build_microtubule_circuit(lattice)
+        counts = sample_counts(qc, args.shots, seed=args.seed)[0]
+        num_bits = qc.num_clbits
+        metrics = consciousness_metrics(counts, num_bits)
+        top = _top(counts)
+    else:
+        from qiskit_aer import AerSimulator
+        simulator = AerSimulator(method=args.method)
+        # MPS: medición diferida, sin mediciones intermedias
+        build = {"deferred": True} if args.method == "matrix_product_state" else {}
+        if args.no_cache:
+            from qiskit import transpile
+            tqc = transpile(build_microtubule_circuit(lattice, **build), simulator)
+        else:
+            from .cache import TranspileCache
+            tqc = TranspileCache().get_or_build(lattice, simulator, **build)
+        with phase("simulate", method=args.method):
+            result = simulator.run(tqc, shots=args.shots, seed_simulator=args.seed).result()
+            record_aer(result)
+        with phase("get_counts"):
+            counts = result.get_counts(0)
+        num_bits = tqc.num_clbits
+        metrics = consciousness_metrics(counts, num_bits)
+        top = _top(counts)
+    elapsed = time.perf_counter() - start
+
+    summary = {"command": "simulate", "method": args.method, "qubits": lattice.num_qubits,
+               "shots": args.shots, "seed": args.seed, "time": elapsed,
+               **metrics, "top": top}
+    if args.output:
+        from .store import ResultsStore
+        summary["run_id"] = ResultsStore(args.output).write_run(
+            counts=counts if num_bits <= 64 else None, num_bits=num_bits,
+            arrays=arrays, metrics={**metrics, "top": top},
+            parameters={**asdict(lattice), "shots": args.shots},
+            seed=args.seed, backend=args.method, timings={"simulation": elapsed},
+            command="simulate")
+
+    lines = [f"{lattice.num_qubits} qubits, {args.shots} shots, método {args.method} "
+             f"({elapsed:.3f} s)",
+             f"Complejidad: {metrics['patterns']:.0f}/{2**num_bits} patrones "
+             f"({metrics['complexity']:.2f}%)",
+             f"Entropía de Shannon: {metrics['shannon_entropy']:.3f} bits "
+             f"({metrics['entropy']}), coherencia {metrics['coherence']}",
+             "Patrones más frecuentes:"]
+    lines += [f"  {pattern}  {value:g}" for pattern, value in top]
+    if "run_id" in summary:
+        lines.append(f"Guardado en {args.output} (run {summary['run_id']})")
+    _emit(args, summary, lines)
+    return 0
+
+
+def _sweep(args) -> int:
+    from .sweeps import sweep
+
+    cache = None
+    if not args.no_cache:
+        from .cache import TranspileCache
+        cache = TranspileCache()
+    lattice = _lattice(args)
+    start = time.perf_counter()
+    rows = sweep(args.alphas, args.betas, lattice=lattice, shots=args.shots,
+                 seed=args.seed, cache=cache, engine=args.engine)
+    elapsed = time.perf_counter() - start
+
+    store = None
+    if args.output:
+        from .store import ResultsStore
+        store = ResultsStore(args.output)
+    for row in rows:
+        counts = row.pop("counts")
+        summary = {"command": "sweep", **row, "top": _top(counts)}
+        if store is not None:
+            summary["run_id"] = store.write_run(
+                counts=counts, num_bits=lattice.num_qubits,
+                metrics={k: v for k, v in summary.items()
+                         if k not in ("command", "alpha", "beta")},
+                parameters={"alpha": row["alpha"], "beta": row["beta"],
+                            "protofilaments": lattice.protofilaments,
+                            "rings": lattice.rings, "shots": args.shots},
+                seed=args.seed, backend="automatic" if args.engine == "aer" else "numpy",
+                timings={"sweep": elapsed}, command="sweep")
+        _emit(args, summary, [f"α={row['alpha']:<8g} β={row['beta']:<8g} "
+                              f"patrones={row['patterns']:<6} "
+                              f"complejidad={row['complexity']:.2f}% "
+                              f"H={row['shannon_entropy']:.3f}"])
+    if not (args.quiet or args.json):
+        print(f"{len(rows)} puntos en {elapsed:.3f} s")
+    return 0
+
+
+def _analyze(args) -> int:
+    from pathlib import Path
+
+    from .store import INDEX, ResultsStore
+
+    if not (Path(args.store) / INDEX).exists():
+        print(f"No hay resultados en {args.store}", file=sys.stderr)
+        return 1
+    store = ResultsStore(args.store)
+    filters = {"command": args.filter_command} if args.filter_command else {}
+    runs = store.runs(**filters)
+
+    for run in runs:
+        metrics = run["metrics"]
+        summary = {"run_id": run["run_id"], "command": run.get("command", run.get("script")),
+                   "parameters": run["parameters"], **metrics}
+        line = f"{run['run_id'][:8]}  {summary['command'] or '-':<24}"
+        if "complexity" in metrics:
+            line += f" complejidad={metrics['complexity']:.2f}%"
+        if "shannon_entropy" in metrics:
+            line += f" H={metrics['shannon_entropy']:.3f}"
+        _emit(args, summary, [line])
+
+    # Distribución media sin cargar todas las ejecuciones en memoria
+    with_probs = [r for r in runs if "probabilities" in r["arrays"]]
+    shapes = {tuple(r["arrays"]["probabilities"]["shape"]) for r in with_probs}
+    if len(shapes) == 1:
+        import numpy as np
+        mean = np.asarray(store.stack("probabilities", with_probs).mean(axis=0))
+        support = mean[mean > 0]
+        n = mean.size.bit_length() - 1
+        best = np.argsort(mean)[::-1][:args.top]
+        summary = {"runs": len(with_probs),
+                   "mean_shannon_entropy": float(-np.sum(support * np.log2(support))),
+                   "top": [(format(int(i), f"0{n}b"), float(mean[i])) for i in best]}
+        lines = [f"Distribución media de {len(with_probs)} ejecuciones: "
+                 f"H={summary['mean_shannon_entropy']:.3f} bits"]
+        lines += [f"  {p}  {v:.4f}" for p, v in summary["top"]]
+        _emit(args, summary, lines)
+    if not (args.quiet or args.json):
+        print(f"{len(runs)} ejecuciones en {args.store}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="orch-or", description="Simulación cuántica Orch-OR de microtúbulos.")
+    parser.add_argument("--profile", default=None, metavar="log|ARCHIVO.jsonl",
+                        help="registra tiempo, CPU y memoria de cada fase")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def common(p):
+        p.add_argument("--qubits", type=int, default=13,
+                       help="protofilamentos (qubits) por anillo (13)")
+        p.add_argument("--rings", type=int, default=1, help="anillos del microtúbulo (1)")
+        p.add_argument("--shots", type=int, default=2048, help="número de shots (2048)")
+        p.add_argument("--seed", type=int, default=None, help="semilla del simulador")
+        p.add_argument("--output", "-o", default=None,
+                       help="directorio del almacén de resultados")
+        p.add_argument("--no-cache", action="store_true",
+                       help="no usar la caché de circuitos transpilados")
+        p.add_argument("--json", action="store_true", help="una línea JSON por resultado")
+        p.add_argument("--quiet", "-q", action="store_true", help="sin salida")
+
+    p = sub.add_parser("simulate", help="simula el protocolo del microtúbulo")
+    common(p)
+    p.add_argument("--method", choices=METHODS, default="automatic",
+                   help="método de AerSimulator, 'exact' (distribución exacta) "
+                        "o 'numpy' (simulador por lotes sin Aer)")
+    p.set_defaults(func=_simulate)
+
+    p = sub.add_parser("sweep", help="barrido de ángulos α/β en un único trabajo")
+    common(p)
+    p.add_argument("--alphas", type=float, nargs="+", default=[0.1], help="ángulos rz de α")
+    p.add_argument("--betas", type=float, nargs="+", default=[0.2], help="ángulos ry de β")
+    p.add_argument("--engine", choices=["aer", "numpy"], default="aer",
+                   help="simulador de la rejilla (aer)")
+    p.set_defaults(func=_sweep)
+
+    p = sub.add_parser("analyze", help="resume un almacén de resultados")
+    p.add_argument("store", help="directorio del almacén")
+    p.add_argument("--command", dest="filter_command", default=None,
+                   help="sólo ejecuciones de este subcomando")
+    p.add_argument("--top", type=int, default=5, help="patrones a mostrar (5)")
+    p.add_argument("--json", action="store_true", help="una línea JSON por resultado")
+    p.add_argument("--quiet", "-q", action="store_true", help="sin salida")
+    p.set_defaults(func=_analyze)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.profile:
+        from .profiling import configure
+        configure(args.profile)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
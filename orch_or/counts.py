@@ -0,0 +1,103 @@
+# =============================================================================
+# ACUMULADOR DE CUENTAS CON MEMORIA ACOTADA
+# =============================================================================
+#
+# Los patrones se guardan como enteros (bit clásico 0 = bit menos
+# significativo, igual que ``get_counts``) en un arreglo NumPy denso de
+# 2^n entradas o, para retículos grandes, en un par de arreglos ordenados
+# (patrones, cuentas).  Los bloques de shots se fusionan a medida que llegan.
+
+from __future__ import annotations
+
+import numpy as np
+
+
+class CountsAccumulator:
+    """Cuentas de medición acumuladas por bloques."""
+
+    def __init__(self, num_bits: int, dense_limit: int = 20):
+        self.num_bits = num_bits
+        self.dense = num_bits <= dense_limit
+        if self.dense:
+            self._counts = np.zeros(2**num_bits, dtype=np.int64)
+        elif num_bits > 64:
+            raise ValueError("El modo disperso admite como máximo 64 bits")
+        else:
+            self._keys = np.zeros(0, dtype=np.uint64)
+            self._values = np.zeros(0, dtype=np.int64)
+
+    @classmethod
+    def from_counts(cls, counts: dict, num_bits: int | None = None, **kwargs):
+        if num_bits is None:
+            num_bits = len(next(iter(counts)).replace(" ", ""))
+        acc = cls(num_bits, **kwargs)
+        acc.add_counts(counts)
+        return acc
+
+    def add_counts(self, counts: dict):
+        """Añade un diccionario ``{bitstring: cuentas}`` de ``get_counts``."""
+        keys = np.fromiter((int(k.replace(" ", ""), 2) for k in counts),
+                           dtype=np.uint64, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+        self.add_arrays(keys, values)
+
+    def add_outcomes(self, outcomes):
+        """Añade resultados individuales de shots como enteros."""
+        keys, values = np.unique(np.asarray(outcomes, dtype=np.uint64),
+                                 return_counts=True)
+        self.add_arrays(keys, values)
+
+    def add_arrays(self, keys, values):
+        keys = np.asarray(keys, dtype=np.uint64)
+        values = np.asarray(values, dtype=np.int64)
+        if self.dense:
+            np.add.at(self._counts, keys.astype(np.intp), values)
+            return
+        keys = np.concatenate([self._keys, keys])
+        values = np.concatenate([self._values, values])
+        self._keys, inverse = np.unique(keys, return_inverse=True)
+        self._values = np.bincount(inverse, weights=values).astype(np.int64)
+
+    def merge(self, other: CountsAccumulator):
+        self.add_arrays(*other.items())
+
+    def items(self) -> tuple[np.ndarray, np.ndarray]:
+        """Patrones observados y sus cuentas."""
+        if self.dense:
+            keys = np.flatnonzero(self._counts)
+            return keys.astype(np.uint64), self._counts[keys]
+        return self._keys, self._values
+
+    @property
+    def shots(self) -> int:
+        return int(self._counts.sum() if self.dense else self._values.sum())
+
+    def __len__(self) -> int:
+        """Número de patrones distintos observados."""
+        if self.dense:
+            return int(np.count_nonzero(self._counts))
+        return len(self._keys)
+
+    def bitstring(self, key) -> str:
+        return format(int(key), f"0{self.num_bits}b")
+
+    def top_k(self, k: int) -> list[tuple[str, int]]:
+        """Los ``k`` patrones más frecuentes por selección parcial."""
+        keys, values = self.items()
+        k = min(k, len(values))
+        if k == 0:
+            return []
+        best = np.argpartition(values, -k)[-k:]
+        best = best[np.argsort(values[best], kind="stable")[::-1]]
+        return [(self.bitstring(keys[i]), int(values[i])) for i in best]
+
+    def probabilities(self) -> np.ndarray:
+        """Distribución densa normalizada (sólo en modo denso)."""
+        if not self.dense:
+            raise ValueError("Distribución densa no disponible con más de "
+                             "dense_limit bits")
+        return self._counts / max(self.shots, 1)
+
+    def to_dict(self) -> dict:
+        keys, values = self.items()
+        return {self.bitstring(k): int(v) for k, v in zip(keys, values)}
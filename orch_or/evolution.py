@@ -0,0 +1,61 @@
+# =============================================================================
+# EVOLUCIÓN POR ETAPAS CON INSTANTÁNEAS EN UNA SOLA PASADA
+# =============================================================================
+#
+# Las etapas de un protocolo se marcan con barreras etiquetadas
+# (``qc.barrier(label="Superposición")``).  El circuito se aplica una sola
+# vez y en cada barrera se guarda el estado, de modo que k etapas cuestan
+# lo mismo que simular el circuito completo.
+
+from __future__ import annotations
+
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Statevector
+
+from .profiling import profiled
+
+
+@profiled("simulate")
+def stage_snapshots(qc: QuantumCircuit, *, initial: str | None = None,
+                    method: str = "statevector") -> dict[str, Statevector]:
+    """Estados tras cada barrera etiquetada de ``qc``, en orden.
+
+    ``initial`` añade el estado |0...0⟩ con esa etiqueta.  Con
+    ``method="aer"`` las barreras se sustituyen por ``save_statevector`` y
+    el circuito se ejecuta en un único trabajo de AerSimulator.
+    """
+    if method == "aer":
+        return _aer_snapshots(qc, initial)
+    if method != "statevector":
+        raise ValueError(f"Método desconocido: {method}")
+
+    state = Statevector.from_int(0, 2**qc.num_qubits)
+    snapshots = {initial: state} if initial is not None else {}
+    for ci in qc.data:
+        op = ci.operation
+        if op.name == "barrier":
+            if op.label is not None:
+                snapshots[op.label] = state
+            continue
+        state = state.evolve(op, qargs=[qc.find_bit(q).index for q in ci.qubits])
+    return snapshots
+
+
+def _aer_snapshots(qc: QuantumCircuit, initial: str | None) -> dict[str, Statevector]:
+    from qiskit_aer import AerSimulator
+    from qiskit_aer.library import SaveStatevector
+
+    labels = [initial] if initial is not None else []
+    tracked = qc.copy_empty_like()
+    if initial is not None:
+        tracked.append(SaveStatevector(qc.num_qubits, label=initial), tracked.qubits)
+    for ci in qc.data:
+        if ci.operation.name == "barrier" and ci.operation.label is not None:
+            label = ci.operation.label
+            labels.append(label)
+            tracked.append(SaveStatevector(qc.num_qubits, label=label), tracked.qubits)
+        else:
+            tracked.append(ci)
+
+    data = AerSimulator(method="statevector").run(tracked, shots=1).result().data(0)
+    return {label: Statevector(data[label]) for label in labels}
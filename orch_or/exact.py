@@ -0,0 +1,120 @@
+# =============================================================================
+# DISTRIBUCIÓN EXACTA SIN MUESTREO DE SHOTS
+# =============================================================================
+#
+# La parte unitaria del circuito se evoluciona una sola vez como vector de
+# estado.  Sólo las mediciones intermedias (la del protofilamento central,
+# cuyo resultado controla el ``if_test``) abren ramas; las mediciones finales
+# se resuelven como marginales exactas de cada rama.
+
+from __future__ import annotations
+
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.circuit import IfElseOp
+from qiskit.quantum_info import Statevector
+
+from .analysis import distribution_metrics
+
+_IGNORED = {"barrier", "delay"}
+
+
+def _terminal_measurements(qc: QuantumCircuit) -> set[int]:
+    """Índices de mediciones tras las que no ocurre nada en su qubit ni bit."""
+    terminal = set()
+    touched_qubits, read_clbits = set(), set()
+    for index in range(len(qc.data) - 1, -1, -1):
+        ci = qc.data[index]
+        qubits = {qc.find_bit(q).index for q in ci.qubits}
+        clbits = {qc.find_bit(c).index for c in ci.clbits}
+        if ci.operation.name == "measure":
+            if not (qubits & touched_qubits or clbits & read_clbits):
+                terminal.add(index)
+            read_clbits |= clbits
+        elif isinstance(ci.operation, IfElseOp):
+            read_clbits |= clbits
+        touched_qubits |= qubits
+    return terminal
+
+
+def _project(sv: Statevector, qubit: int, outcome: int, prob: float):
+    mask = (np.arange(len(sv.data)) >> qubit) & 1 == outcome
+    return Statevector(np.where(mask, sv.data, 0) / np.sqrt(prob))
+
+
+def _evolve_block(sv: Statevector, block: QuantumCircuit, qargs) -> Statevector:
+    for ci in block.data:
+        if ci.operation.name in _IGNORED:
+            continue
+        if ci.operation.name == "measure" or isinstance(ci.operation, IfElseOp):
+            raise ValueError("Mediciones anidadas en if_test no soportadas")
+        sv = sv.evolve(ci.operation,
+                       qargs=[qargs[block.find_bit(q).index] for q in ci.qubits])
+    return sv
+
+
+def exact_distribution(qc: QuantumCircuit, tol: float = 1e-12) -> np.ndarray:
+    """Probabilidad exacta de cada patrón clásico (índice = entero de los bits).
+
+    El orden de bits coincide con ``get_counts``: el bit clásico 0 es el
+    menos significativo.
+    """
+    terminal = _terminal_measurements(qc)
+    # Cada rama: (probabilidad, estado, bits clásicos ya fijados)
+    branches = [(1.0, Statevector.from_int(0, 2**qc.num_qubits), 0)]
+    final = []  # (qubit, bit clásico) de las mediciones finales
+
+    for index, ci in enumerate(qc.data):
+        op = ci.operation
+        qargs = [qc.find_bit(q).index for q in ci.qubits]
+        if op.name in _IGNORED:
+            continue
+        if op.name == "measure":
+            q, c = qargs[0], qc.find_bit(ci.clbits[0]).index
+            if index in terminal:
+                final.append((q, c))
+                continue
+            split = []
+            for p, sv, bits in branches:
+                p1 = float(sv.probabilities([q])[1])
+                for outcome, po in ((0, 1.0 - p1), (1, p1)):
+                    if po > tol:
+                        bits_o = (bits & ~(1 << c)) | (outcome << c)
+                        split.append((p * po, _project(sv, q, outcome, po), bits_o))
+            branches = split
+        elif isinstance(op, IfElseOp):
+            (target, value) = op.condition
+            cbits = ([target] if not hasattr(target, "__len__") else list(target))
+            positions = [qc.find_bit(c).index for c in cbits]
+            evolved = []
+            for p, sv, bits in branches:
+                register = sum(((bits >> pos) & 1) << k for k, pos in enumerate(positions))
+                body = op.blocks[0] if register == value else (
+                    op.blocks[1] if len(op.blocks) > 1 else None)
+                if body is not None:
+                    sv = _evolve_block(sv, body, qargs)
+                evolved.append((p, sv, bits))
+            branches = evolved
+        else:
+            branches = [(p, sv.evolve(op, qargs=qargs), bits) for p, sv, bits in branches]
+
+    # Mediciones finales: marginales exactas de cada rama
+    qubits = [q for q, _ in final]
+    outcomes = np.arange(2**len(final))
+    offsets = np.zeros_like(outcomes)
+    for k, (_, c) in enumerate(final):
+        offsets |= ((outcomes >> k) & 1) << c
+    measured = 0
+    for _, c in final:
+        measured |= 1 << c
+
+    probs = np.zeros(2**qc.num_clbits)
+    for p, sv, bits in branches:
+        marginal = sv.probabilities(qubits) if qubits else np.ones(1)
+        np.add.at(probs, (bits & ~measured) | offsets, p * marginal)
+    return probs
+
+
+def exact_metrics(qc: QuantumCircuit, shots: int | None = None) -> dict:
+    """Métricas de consciencia calculadas sobre la distribución exacta."""
+    return distribution_metrics(exact_distribution(qc), qc.num_clbits, shots=shots)
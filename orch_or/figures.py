@@ -0,0 +1,198 @@
+# =============================================================================
+# FIGURAS SIN PANTALLA (AGG) EN UN POOL DE PROCESOS
+# =============================================================================
+#
+# Las figuras se crean con matplotlib.figure.Figure, sin pyplot ni ventana,
+# y se guardan en PNG/SVG.  El histograma se agrupa en los k patrones más
+# frecuentes, la malla de la esfera de Bloch se calcula una sola vez por
+# proceso y los lotes de figuras (p. ej. de un barrido) se reparten entre
+# varios procesos.
+
+from __future__ import annotations
+
+import functools
+import heapq
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import matplotlib
+import numpy as np
+from matplotlib.figure import Figure
+from qiskit.visualization import plot_histogram, plot_state_city, plot_state_qsphere
+
+from .profiling import profiled
+from .statevector_metrics import state_metrics
+
+HISTOGRAM_TOP = 32
+
+# Los scripts guardan sus figuras aquí en vez de llamar a plt.show()
+FIGURES_DIR_ENV = "ORCH_OR_FIGURES"
+FIGURE_FORMATS = tuple(os.environ.get("ORCH_OR_FIGURE_FORMATS", "png").split(","))
+
+
+def output_directory() -> Path | None:
+    """Directorio de ORCH_OR_FIGURES, o None para mostrar en pantalla."""
+    directory = os.environ.get(FIGURES_DIR_ENV)
+    return Path(directory) if directory else None
+
+
+def _init_worker():
+    matplotlib.use("Agg")
+
+
+@functools.lru_cache(maxsize=None)
+def sphere_mesh(resolution: int = 50) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Malla de la esfera unidad para las esferas de Bloch."""
+    u = np.linspace(0, 2 * np.pi, resolution)
+    v = np.linspace(0, np.pi, resolution)
+    x = np.outer(np.cos(u), np.sin(v))
+    y = np.outer(np.sin(u), np.sin(v))
+    z = np.outer(np.ones(resolution), np.cos(v))
+    for axis in (x, y, z):
+        axis.flags.writeable = False
+    return x, y, z
+
+
+def bin_counts(counts: dict, top: int = HISTOGRAM_TOP) -> dict:
+    """Los ``top`` patrones más frecuentes más una barra "otros" con el resto."""
+    if len(counts) <= top:
+        return dict(counts)
+    best = dict(heapq.nlargest(top, counts.items(), key=lambda item: item[1]))
+    best["otros"] = sum(counts.values()) - sum(best.values())
+    return best
+
+
+def histogram_figure(counts: dict, *, top: int = HISTOGRAM_TOP,
+                     title: str | None = None) -> Figure:
+    """Histograma de los ``top`` patrones más frecuentes (el resto, agrupado)."""
+    fig = Figure(figsize=(15, 8))
+    ax = fig.add_subplot()
+    plot_histogram(bin_counts(counts, top), sort="value_desc",
+                   bar_labels=len(counts) <= top, ax=ax)
+    if title:
+        ax.set_title(title, fontsize=14)
+    ax.tick_params(axis="x", labelrotation=45)
+    fig.tight_layout()
+    return fig
+
+
+def bloch_figure(state, names=None, *, title: str | None = None) -> Figure:
+    """Esferas de Bloch de cada qubit a partir de sus estados reducidos."""
+    metrics = state_metrics(state)
+    vectors = metrics["bloch"]
+    names = names or [f"Q{i}" for i in range(len(vectors))]
+    x, y, z = sphere_mesh()
+
+    fig = Figure(figsize=(5 * len(vectors), 5))
+    for i, (vec, name) in enumerate(zip(vectors, names)):
+        ax = fig.add_subplot(1, len(vectors), i + 1, projection="3d")
+        ax.plot_surface(x, y, z, alpha=0.1, color="lightblue")
+        ax.quiver(0, 0, 0, *vec, color="red", arrow_length_ratio=0.1, linewidth=3)
+        ax.set_xlim([-1, 1])
+        ax.set_ylim([-1, 1])
+        ax.set_zlim([-1, 1])
+        ax.set_xlabel("X")
+        ax.set_ylabel("Y")
+        ax.set_zlabel("Z")
+        ax.set_title(f"{name}\nBloch: ({vec[0]:.2f}, {vec[1]:.2f}, {vec[2]:.2f})"
+                     f"\nPureza: {metrics['purity'][i]:.3f}")
+    if title:
+        fig.suptitle(title, fontsize=14)
+    return fig
+
+
+def qsphere_figure(state, *, title: str | None = None) -> Figure:
+    """Q-sphere del estado completo (requiere seaborn)."""
+    fig = Figure(figsize=(7, 7))
+    plot_state_qsphere(state, ax=fig.add_subplot(projection="3d"))
+    if title:
+        fig.suptitle(title, fontsize=14)
+    return fig
+
+
+def city_figure(states: dict, *, title: str | None = None) -> Figure:
+    """City plots (parte real e imaginaria) de varios estados ``{etiqueta: estado}``."""
+    fig = Figure(figsize=(5 * len(states), 9))
+    for i, (label, state) in enumerate(states.items()):
+        ax_real = fig.add_subplot(2, len(states), i + 1, projection="3d")
+        ax_imag = fig.add_subplot(2, len(states), len(states) + i + 1, projection="3d")
+        plot_state_city(state, ax_real=ax_real, ax_imag=ax_imag)
+        ax_real.set_title(f"{label}\nRe[ρ]")
+        ax_imag.set_title("Im[ρ]")
+    if title:
+        fig.suptitle(title, fontsize=14)
+    return fig
+
+
+def evolution_figure(states: dict, *, title: str | None = None) -> Figure:
+    """Probabilidades de la base computacional en cada etapa ``{etiqueta: estado}``."""
+    cols = min(3, len(states))
+    rows = -(-len(states) // cols)
+    fig = Figure(figsize=(4 * cols, 4 * rows))
+    for i, (label, state) in enumerate(states.items()):
+        probs = np.abs(np.asarray(getattr(state, "data", state))) ** 2
+        n = probs.size.bit_length() - 1
+        ax = fig.add_subplot(rows, cols, i + 1)
+        ax.bar(range(len(probs)), probs, alpha=0.7)
+        ax.set_title(label)
+        ax.set_xlabel("Estado")
+        ax.set_ylabel("Probabilidad")
+        if len(probs) <= 16:
+            ax.set_xticks(range(len(probs)), [f"|{k:0{n}b}⟩" for k in range(len(probs))],
+                          rotation=45)
+    if title:
+        fig.suptitle(title, fontsize=14)
+    fig.tight_layout()
+    return fig
+
+
+RENDERERS = {
+    "histogram": histogram_figure,
+    "bloch": bloch_figure,
+    "qsphere": qsphere_figure,
+    "city": city_figure,
+    "evolution": evolution_figure,
+}
+
+
+@profiled("render")
+def save_figure(fig: Figure, path, formats=("png",), dpi: int = 100) -> list[Path]:
+    """Guarda ``fig`` en cada formato con la extensión correspondiente."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for fmt in formats:
+        target = path.with_suffix(f".{fmt}")
+        fig.savefig(target, format=fmt, dpi=dpi)
+        paths.append(target)
+    return paths
+
+
+@profiled("figure")
+def _build(kind: str, data, kwargs: dict) -> Figure:
+    return RENDERERS[kind](data, **kwargs)
+
+
+def _render(task) -> list[Path]:
+    kind, data, path, kwargs, formats = task
+    return save_figure(_build(kind, data, kwargs), path, formats)
+
+
+def render_figures(jobs, *, formats=("png",), workers: int | None = None) -> list[list[Path]]:
+    """Renderiza ``jobs`` = ``[(tipo, datos, ruta[, kwargs]), ...]`` a disco.
+
+    ``tipo`` es una clave de RENDERERS y ``ruta`` no lleva extensión.
+    ``workers=1`` renderiza en el proceso actual; con más workers el script
+    que llama debe proteger su código con ``if __name__ == "__main__"``.
+    """
+    tasks = [(job[0], job[1], job[2], job[3] if len(job) > 3 else {}, tuple(formats))
+             for job in jobs]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        return [_render(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks)),
+                             mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker) as pool:
+        return list(pool.map(_render, tasks))
@@ -0,0 +1,315 @@
+# =============================================================================
+# SIMULADOR NUMPY POR LOTES PARA EL CONJUNTO DE COMPUERTAS DEL PROYECTO
+# =============================================================================
+#
+# Aplica h, cx, rz, ry, rx, x, y, z, measure e if_test directamente sobre un
+# tensor (lote, ramas, 2, ..., 2) con operaciones NumPy in situ sobre vistas
+# de cada qubit, sin importar ni inicializar Aer.  El eje de lote permite
+# evolucionar miles de variantes de parámetros del mismo circuito en una
+# sola pasada (``parameter_binds`` con el mismo formato que Aer).
+#
+# Cada medición intermedia duplica el eje de ramas con las amplitudes
+# proyectadas sin normalizar: la probabilidad de una rama es su norma y los
+# bits clásicos ya medidos son los mismos para todo el lote, así que el
+# ``if_test`` se resuelve rama a rama.  Las mediciones finales son
+# marginales exactas, como en ``exact_distribution``.
+
+from __future__ import annotations
+
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.circuit import IfElseOp, Parameter, ParameterExpression
+
+from .exact import _terminal_measurements
+from .profiling import phase
+
+_IGNORED = {"barrier", "delay"}
+
+# Tamaño máximo del tensor de estado de un bloque del lote (bytes)
+CHUNK_BYTES = 2**28
+
+_SQRT1_2 = 1 / np.sqrt(2)
+
+
+class _State:
+    """Tensor (lote, ramas, 2, ..., 2); el qubit k es el eje 2 + n - 1 - k."""
+
+    def __init__(self, batch: int, num_qubits: int):
+        self.n = num_qubits
+        self.psi = np.zeros((batch, 1) + (2,) * num_qubits, dtype=complex)
+        self.psi[(slice(None), 0) + (0,) * num_qubits] = 1.0
+        self.bits = [0]     # Bits clásicos de cada rama
+
+    def view(self, fixed: dict, branch=slice(None)) -> np.ndarray:
+        key = [slice(None), branch] + [slice(None)] * self.n
+        for qubit, value in fixed.items():
+            key[2 + self.n - 1 - qubit] = value
+        return self.psi[tuple(key)]
+
+    def measure(self, qubit: int, clbit: int, tol: float):
+        """Divide cada rama en los resultados 0 y 1 del qubit."""
+        k = len(self.bits)
+        self.psi = np.concatenate([self.psi, self.psi], axis=1)
+        self.view({qubit: 1}, slice(0, k))[...] = 0
+        self.view({qubit: 0}, slice(k, 2 * k))[...] = 0
+        self.bits = ([b & ~(1 << clbit) for b in self.bits]
+                     + [b | (1 << clbit) for b in self.bits])
+        norms = np.sum(np.abs(self.psi.reshape(*self.psi.shape[:2], -1))**2, axis=-1)
+        keep = np.flatnonzero(norms.max(axis=0) > tol)
+        if len(keep) < 2 * k:
+            self.psi = self.psi[:, keep]
+            self.bits = [self.bits[i] for i in keep]
+
+
+def _batched(value, n: int):
+    """Escalar, o arreglo del lote con forma que difunde sobre (ramas, 2, ...)."""
+    value = np.asarray(value)
+    return value.reshape(value.shape + (1,) * n) if value.ndim else value
+
+
+def _resolve(params, binds: dict, batch: int) -> list:
+    """Valores numéricos de los parámetros de una compuerta (arreglos del lote)."""
+    values = []
+    for p in params:
+        if not isinstance(p, ParameterExpression):
+            values.append(p)
+        elif not p.parameters:
+            values.append(float(p))
+        elif isinstance(p, Parameter):
+            values.append(binds[p])
+        else:
+            values.append(np.array([float(p.bind({q: binds[q][i] for q in p.parameters}))
+                                    for i in range(batch)]))
+    return values
+
+
+def _matrices(op, params, batch: int) -> np.ndarray:
+    """Matriz de ``op`` (d, d) o, con parámetros del lote, (lote, d, d)."""
+    if all(np.ndim(p) == 0 for p in params):
+        return op.to_matrix() if not params else type(op)(*map(float, params)).to_matrix()
+    columns = [np.broadcast_to(p, (batch,)) for p in params]
+    return np.stack([type(op)(*(float(c[i]) for c in columns)).to_matrix()
+                     for i in range(batch)])
+
+
+def _apply_1q(state: _State, op, params, qubit: int, branch, batch: int):
+    a0 = state.view({qubit: 0}, branch)
+    a1 = state.view({qubit: 1}, branch)
+    name, n = op.name, state.n
+    if name == "x":
+        tmp = a0.copy()
+        a0[...] = a1
+        a1[...] = tmp
+    elif name == "y":
+        tmp = a0.copy()
+        np.multiply(a1, -1j, out=a0)
+        np.multiply(tmp, 1j, out=a1)
+    elif name == "z":
+        a1 *= -1
+    elif name == "h":
+        tmp = a0 + a1
+        a1 -= a0
+        a1 *= -_SQRT1_2
+        tmp *= _SQRT1_2
+        a0[...] = tmp
+    elif name == "rz":
+        half = _batched(np.asarray(params[0], dtype=float) / 2, n)
+        a0 *= np.exp(-1j * half)
+        a1 *= np.exp(1j * half)
+    elif name in ("ry", "rx"):
+        half = np.asarray(params[0], dtype=float) / 2
+        c = _batched(np.cos(half), n)
+        s = _batched(np.sin(half), n)
+        if name == "rx":
+            # [[c, -is], [-is, c]]
+            s = -1j * s
+            tmp = c * a0 + s * a1
+            a1 *= c
+            a1 += s * a0
+        else:
+            # [[c, -s], [s, c]]
+            tmp = c * a0 - s * a1
+            a1 *= c
+            a1 += s * a0
+        a0[...] = tmp
+    else:
+        m = _matrices(op, params, batch)
+        m00, m01, m10, m11 = (_batched(m[..., i, j], n) for i in (0, 1) for j in (0, 1))
+        tmp = m00 * a0 + m01 * a1
+        a1 *= m11
+        a1 += m10 * a0
+        a0[...] = tmp
+
+
+def _apply_2q(state: _State, op, params, qubits, branch, batch: int):
+    q0, q1 = qubits
+    if op.name == "cx":
+        a0 = state.view({q0: 1, q1: 0}, branch)
+        a1 = state.view({q0: 1, q1: 1}, branch)
+        tmp = a0.copy()
+        a0[...] = a1
+        a1[...] = tmp
+        return
+    # Orden de Qiskit: el índice de la matriz es 2·b(q1) + b(q0)
+    m = _matrices(op, params, batch)
+    views = [state.view({q0: k & 1, q1: k >> 1}, branch) for k in range(4)]
+    # Tras el lote, una vista de dos qubits tiene n - 1 ejes (ramas y n - 2 qubits)
+    new = [sum(_batched(m[..., row, col], state.n - 1) * views[col] for col in range(4))
+           for row in range(4)]
+    for view, value in zip(views, new):
+        view[...] = value
+
+
+def _apply(state: _State, op, qubits, binds: dict, batch: int, branch=slice(None)):
+    params = _resolve(op.params, binds, batch)
+    if len(qubits) == 1:
+        _apply_1q(state, op, params, qubits[0], branch, batch)
+    elif len(qubits) == 2:
+        _apply_2q(state, op, params, qubits, branch, batch)
+    else:
+        raise ValueError(f"Compuerta no soportada por el simulador NumPy: {op.name}")
+
+
+def _condition(op: IfElseOp, qc: QuantumCircuit) -> tuple[list[int], int]:
+    if not isinstance(op.condition, tuple):
+        raise ValueError("Sólo se admiten condiciones (bit o registro, valor)")
+    target, value = op.condition
+    cbits = [target] if not hasattr(target, "__len__") else list(target)
+    return [qc.find_bit(c).index for c in cbits], value
+
+
+def _bind_arrays(parameter_binds: dict | None) -> tuple[dict, int]:
+    binds = {p: np.asarray(v, dtype=float).reshape(-1)
+             for p, v in (parameter_binds or {}).items()}
+    sizes = {len(v) for v in binds.values()}
+    if len(sizes) > 1:
+        raise ValueError("Todos los parámetros deben tener el mismo número de valores")
+    return binds, sizes.pop() if sizes else 1
+
+
+def _evolve(qc: QuantumCircuit, binds: dict, batch: int, tol: float = 1e-12):
+    """Evoluciona el lote; devuelve el estado y las mediciones finales (qubit, bit)."""
+    missing = set(qc.parameters) - set(binds)
+    if missing:
+        raise ValueError(f"Parámetros sin valor: {sorted(p.name for p in missing)}")
+    terminal = _terminal_measurements(qc)
+    state = _State(batch, qc.num_qubits)
+    final = []
+    for index, ci in enumerate(qc.data):
+        op = ci.operation
+        if op.name in _IGNORED:
+            continue
+        qubits = [qc.find_bit(q).index for q in ci.qubits]
+        if op.name == "measure":
+            clbit = qc.find_bit(ci.clbits[0]).index
+            if index in terminal:
+                final.append((qubits[0], clbit))
+            else:
+                state.measure(qubits[0], clbit, tol)
+        elif isinstance(op, IfElseOp):
+            positions, value = _condition(op, qc)
+            for branch, bits in enumerate(state.bits):
+                register = sum(((bits >> pos) & 1) << k for k, pos in enumerate(positions))
+                body = op.blocks[0] if register == value else (
+                    op.blocks[1] if len(op.blocks) > 1 else None)
+                if body is None:
+                    continue
+                for inner in body.data:
+                    if inner.operation.name in _IGNORED:
+                        continue
+                    if inner.operation.name == "measure" or isinstance(inner.operation, IfElseOp):
+                        raise ValueError("Mediciones anidadas en if_test no soportadas")
+                    _apply(state, inner.operation,
+                           [qubits[body.find_bit(q).index] for q in inner.qubits],
+                           binds, batch, slice(branch, branch + 1))
+        else:
+            _apply(state, op, qubits, binds, batch)
+    phase_value = _resolve([qc.global_phase], binds, batch)[0]
+    if np.any(phase_value):
+        state.psi *= _batched(np.exp(1j * np.asarray(phase_value)), state.n + 1)
+    return state, final
+
+
+def _chunks(qc: QuantumCircuit, binds: dict, batch: int):
+    """Bloques del lote cuyo estado (con todas sus ramas) cabe en CHUNK_BYTES."""
+    measurements = sum(1 for ci in qc.data if ci.operation.name == "measure")
+    branches = 2 ** (measurements - len(_terminal_measurements(qc)))
+    size = max(1, CHUNK_BYTES // (16 * 2**qc.num_qubits * min(branches, 2**qc.num_qubits)))
+    for start in range(0, batch, size):
+        stop = min(start + size, batch)
+        yield {p: v[start:stop] for p, v in binds.items()}, stop - start
+
+
+def statevectors(qc: QuantumCircuit, parameter_binds: dict | None = None) -> np.ndarray:
+    """Vectores de estado (lote, 2^n) de un circuito sin mediciones.
+
+    El orden de las amplitudes es el de Qiskit (qubit 0 = bit menos
+    significativo) y la fase global se incluye, como en Aer.
+    """
+    if any(ci.operation.name == "measure" or isinstance(ci.operation, IfElseOp)
+           for ci in qc.data):
+        raise ValueError("statevectors requiere un circuito sin mediciones")
+    binds, batch = _bind_arrays(parameter_binds)
+    with phase("simulate", engine="numpy", batch=batch):
+        blocks = [_evolve(qc, chunk, size)[0].psi.reshape(size, -1)
+                  for chunk, size in _chunks(qc, binds, batch)]
+    return np.concatenate(blocks)
+
+
+def probabilities(qc: QuantumCircuit, parameter_binds: dict | None = None) -> np.ndarray:
+    """Distribución exacta (lote, 2^num_clbits) de los bits clásicos.
+
+    Es la versión por lotes de ``exact_distribution``: el índice es el
+    entero de los bits con el bit clásico 0 como menos significativo.
+    """
+    binds, batch = _bind_arrays(parameter_binds)
+    n = qc.num_qubits
+    out = np.zeros((batch, 2**qc.num_clbits))
+    start = 0
+    with phase("simulate", engine="numpy", batch=batch):
+        for chunk, size in _chunks(qc, binds, batch):
+            state, final = _evolve(qc, chunk, size)
+            measured = sum(1 << c for _, c in final)
+            outcomes = np.arange(2**len(final))
+            offsets = np.zeros_like(outcomes)
+            for k, (_, c) in enumerate(final):
+                offsets |= ((outcomes >> k) & 1) << c
+            # Ejes del tensor de cada rama: el qubit medido de mayor rango primero
+            kept = [1 + n - 1 - q for q, _ in reversed(final)]
+            order = [0] + kept + [a for a in range(1, n + 1) if a not in kept]
+            for branch, bits in enumerate(state.bits):
+                p = np.abs(state.psi[:, branch])**2
+                marginal = p.transpose(order).reshape(size, len(outcomes), -1).sum(axis=-1)
+                out[start:start + size, (bits & ~measured) | offsets] += marginal
+            start += size
+    return out
+
+
+def _counts_keys(qc: QuantumCircuit, indices) -> list[str]:
+    """Claves de ``get_counts``: registros separados por espacios, el primero a la derecha."""
+    width = qc.num_clbits
+    keys = [format(int(i), f"0{width}b") for i in indices]
+    if len(qc.cregs) <= 1:
+        return keys
+    sizes = [creg.size for creg in qc.cregs]
+    split = []
+    for key in keys:
+        parts, stop = [], width
+        for size in sizes:
+            parts.append(key[stop - size:stop])
+            stop -= size
+        split.append(" ".join(reversed(parts)))
+    return split
+
+
+def sample_counts(qc: QuantumCircuit, shots: int, parameter_binds: dict | None = None,
+                  seed: int | None = None) -> list[dict]:
+    """Cuentas de ``shots`` muestras de cada elemento del lote, como ``get_counts``."""
+    probs = probabilities(qc, parameter_binds)
+    rng = np.random.default_rng(seed)
+    results = []
+    for row in probs:
+        sampled = rng.multinomial(shots, row / row.sum())
+        nonzero = np.flatnonzero(sampled)
+        results.append(dict(zip(_counts_keys(qc, nonzero), sampled[nonzero].tolist())))
+    return results
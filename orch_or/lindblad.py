@@ -0,0 +1,191 @@
+# =============================================================================
+# DECOHERENCIA TÉRMICA: ECUACIÓN MAESTRA DE LINDBLAD Y SALTOS CUÁNTICOS
+# =============================================================================
+#
+#   dρ/dt = -i[H, ρ] + Σ_k (L_k ρ L_k† - ½{L_k† L_k, ρ})
+#
+# con L = sqrt(γφ/2) Z_i (desfase) y L = sqrt(γa) σ⁻_i (amortiguamiento de
+# amplitud) por protofilamento.  Con esta normalización la coherencia de un
+# qubit aislado decae como exp(-γφ t), igual que ``coherence_simple`` de la
+# caja gris de Caja_negra.m.
+#
+# Modo "density": superoperador de Liouville 4^N (N pequeño).
+# Modo "jumps": trayectorias Monte-Carlo de función de onda, O(2^N) cada una
+# y repartidas en un pool de procesos.
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy.sparse as sp
+from qiskit.quantum_info import SparsePauliOp
+from scipy.linalg import expm
+from scipy.sparse.linalg import expm_multiply
+
+from .parallel import chunk_seeds
+from .statevector_metrics import single_qubit_states
+
+DENSITY_MAX_QUBITS = 6
+DENSE_STEP_MAX_QUBITS = 10
+
+
+def simple_coherence(gamma_phase, times) -> np.ndarray:
+    """Modelo simple de la caja gris: exp(-γφ t)."""
+    return np.exp(-np.asarray(gamma_phase, dtype=float)[..., None] * np.asarray(times))
+
+
+def _as_matrix(hamiltonian):
+    if isinstance(hamiltonian, SparsePauliOp):
+        return hamiltonian.to_matrix(sparse=True)
+    return sp.csr_matrix(hamiltonian)
+
+
+def collapse_operators(n: int, dephasing=0.0, damping=0.0) -> list:
+    """Operadores de salto de desfase y amortiguamiento por protofilamento."""
+    dephasing = np.broadcast_to(np.asarray(dephasing, dtype=float), (n,))
+    damping = np.broadcast_to(np.asarray(damping, dtype=float), (n,))
+    ops = []
+    for i in range(n):
+        if dephasing[i] > 0:
+            ops.append(SparsePauliOp.from_sparse_list(
+                [("Z", [i], np.sqrt(dephasing[i] / 2))], n))
+        if damping[i] > 0:
+            # σ⁻ = |0⟩⟨1| = (X + iY) / 2
+            amp = np.sqrt(damping[i]) / 2
+            ops.append(SparsePauliOp.from_sparse_list(
+                [("X", [i], amp), ("Y", [i], 1j * amp)], n))
+    return [op.to_matrix(sparse=True) for op in ops]
+
+
+def _dm_coherences(rho: np.ndarray, n: int) -> np.ndarray:
+    """ρ01 de cada qubit a partir de la matriz densidad completa."""
+    tensor = rho.reshape((2,) * (2 * n))
+    out = np.empty(n, dtype=complex)
+    for k in range(n):
+        axis = n - 1 - k
+        moved = np.moveaxis(tensor, (axis, axis + n), (0, 1)).reshape(2, 2, 2**(n - 1), 2**(n - 1))
+        out[k] = np.trace(moved, axis1=2, axis2=3)[0, 1]
+    return out
+
+
+def lindblad_evolve(hamiltonian, psi0, times, dephasing=0.0, damping=0.0) -> dict:
+    """Evolución exacta de la matriz densidad sobre ``times`` (N pequeño)."""
+    H = _as_matrix(hamiltonian)
+    psi0 = np.asarray(getattr(psi0, "data", psi0), dtype=complex)
+    dim = H.shape[0]
+    n = dim.bit_length() - 1
+    eye = sp.identity(dim, format="csr")
+
+    # vec por filas: vec(A ρ B) = (A ⊗ Bᵀ) vec(ρ)
+    liouvillian = -1j * (sp.kron(H, eye) - sp.kron(eye, H.T))
+    for L in collapse_operators(n, dephasing, damping):
+        LdL = (L.conj().T @ L)
+        liouvillian = liouvillian + sp.kron(L, L.conj()) \
+            - 0.5 * sp.kron(LdL, eye) - 0.5 * sp.kron(eye, LdL.T)
+    liouvillian = liouvillian.tocsr()
+
+    times = np.asarray(times, dtype=float)
+    rho0 = np.outer(psi0, psi0.conj()).reshape(-1)
+    rhos = expm_multiply(liouvillian, rho0, start=times[0], stop=times[-1],
+                         num=len(times), endpoint=True)
+    rho01 = np.array([_dm_coherences(r.reshape(dim, dim), n) for r in rhos])
+    return _report(times, rho01)
+
+
+# Operadores comunes a todas las trayectorias: se envían una vez a cada
+# proceso con el ``initializer`` del pool y cada tarea sólo lleva su semilla
+_SHARED: tuple | None = None
+
+
+def _init_worker(shared: tuple):
+    global _SHARED
+    _SHARED = shared
+
+
+def _trajectory(seed: int):
+    h_eff, step, collapse, psi0, times, substeps = _SHARED
+    rng = np.random.default_rng(seed)
+    psi, threshold = psi0.copy(), rng.random()
+    rho01 = np.empty((len(times), single_qubit_states(psi0).shape[0]), dtype=complex)
+    rho01[0] = single_qubit_states(psi0)[:, 0, 1]
+
+    for k in range(1, len(times)):
+        dt = (times[k] - times[k - 1]) / substeps
+        for _ in range(substeps):
+            psi = step @ psi if step is not None else expm_multiply(-1j * dt * h_eff, psi)
+            if np.vdot(psi, psi).real < threshold:
+                jumped = [L @ psi for L in collapse]
+                weights = np.array([np.vdot(v, v).real for v in jumped])
+                choice = rng.choice(len(jumped), p=weights / weights.sum())
+                psi = jumped[choice] / np.sqrt(weights[choice])
+                threshold = rng.random()
+        rho01[k] = single_qubit_states(psi / np.linalg.norm(psi))[:, 0, 1]
+    return rho01
+
+
+def quantum_jumps(hamiltonian, psi0, times, dephasing=0.0, damping=0.0, *,
+                  trajectories: int = 100, substeps: int = 10, seed: int = 0,
+                  workers: int | None = 1) -> dict:
+    """Promedio de ``trajectories`` trayectorias de saltos cuánticos.
+
+    Cada trayectoria tiene su propia semilla derivada de ``seed``, así que el
+    resultado no depende de ``workers``.
+    """
+    H = _as_matrix(hamiltonian)
+    psi0 = np.asarray(getattr(psi0, "data", psi0), dtype=complex)
+    n = H.shape[0].bit_length() - 1
+    collapse = collapse_operators(n, dephasing, damping)
+    h_eff = H.astype(complex)
+    for L in collapse:
+        h_eff = h_eff - 0.5j * (L.conj().T @ L)
+    h_eff = h_eff.tocsr()
+
+    times = np.asarray(times, dtype=float)
+    # Propagador denso de un subpaso si el espacio es pequeño y la rejilla uniforme
+    step = None
+    steps = np.diff(times)
+    if n <= DENSE_STEP_MAX_QUBITS and len(steps) and np.allclose(steps, steps[0]):
+        step = expm(-1j * steps[0] / substeps * h_eff.toarray())
+    shared = (h_eff, step, collapse, psi0, times, substeps)
+    seeds = chunk_seeds(seed, trajectories)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(shared)
+        try:
+            results = [_trajectory(s) for s in seeds]
+        finally:
+            _init_worker(None)
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, trajectories),
+                                 mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_worker, initargs=(shared,)) as pool:
+            results = list(pool.map(_trajectory, seeds))
+    return _report(times, np.mean(results, axis=0))
+
+
+def _report(times, rho01) -> dict:
+    coherence = np.abs(rho01)
+    initial = np.where(coherence[0] > 1e-12, coherence[0], 1.0)
+    return {
+        "times": times,
+        "rho01": rho01,
+        "coherence": coherence,                    # |ρ01| por qubit, (T, N)
+        "relative_coherence": coherence / initial,  # comparable con exp(-γφ t)
+    }
+
+
+def decohere(hamiltonian, psi0, times, dephasing=0.0, damping=0.0, *,
+             method: str = "auto", **kwargs) -> dict:
+    """Elige matriz densidad para N <= DENSITY_MAX_QUBITS y saltos si no."""
+    H = _as_matrix(hamiltonian)
+    if method == "auto":
+        n = H.shape[0].bit_length() - 1
+        method = "density" if n <= DENSITY_MAX_QUBITS else "jumps"
+    if method == "density":
+        return lindblad_evolve(H, psi0, times, dephasing, damping)
+    if method == "jumps":
+        return quantum_jumps(H, psi0, times, dephasing, damping, **kwargs)
+    raise ValueError(f"Método desconocido: {method}")
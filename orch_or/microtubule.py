@@ -0,0 +1,218 @@
+# =============================================================================
+# CONSTRUCTOR DEL CIRCUITO ORCH-OR: MICROTÚBULO PARAMETRIZADO
+# =============================================================================
+#
+# Genera el mismo protocolo por fases que 13qbits.py (superposición,
+# entrelazamiento, diferenciación α/β, decoherencia, reducción objetiva y
+# mediciones neurales) para cualquier número de protofilamentos y anillos
+# apilados, sin escribir nada en consola.
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+from qiskit import QuantumCircuit
+
+from .profiling import phase, profiled
+
+
+@dataclass(frozen=True)
+class MicrotubuleLattice:
+    """Geometría y parámetros del protocolo de un microtúbulo.
+
+    Los qubits se numeran anillo por anillo: el protofilamento ``p`` del
+    anillo ``r`` es el qubit ``r * protofilaments + p``.  Las posiciones de
+    ruido y de medición se dan relativas a un anillo (``None`` = valores de
+    13qbits.py generalizados a ``protofilaments``).
+    """
+
+    protofilaments: int = 13
+    rings: int = 1
+    superposed: int | None = None      # Protofilamentos con H por anillo
+    diametral_links: int = 3           # Conexiones p -> p + P//2 por anillo
+    helix_start: int = 0               # Desplazamiento helicoidal entre anillos
+    alpha_angle: object = 0.1          # rz en α-tubulina (float o Parameter)
+    beta_angle: object = 0.2           # ry en β-tubulina (float o Parameter)
+    phase_noise: tuple[int, ...] | None = None
+    bitflip_noise: tuple[int, ...] | None = None
+    intuitive: tuple[int, ...] | None = None   # Base X
+    emotional: tuple[int, ...] | None = None   # Base Y
+    logical: tuple[int, ...] | None = None     # Base Z
+
+    def __post_init__(self):
+        if self.protofilaments < 3:
+            raise ValueError("Se necesitan al menos 3 protofilamentos")
+        if self.rings < 1:
+            raise ValueError("Se necesita al menos un anillo")
+        # Cada protofilamento se mide en una sola base (el ruido de bit-flip
+        # sí puede caer en uno medido, como el qubit 5 de 13qbits.py)
+        groups = {"center": (self.center,), "intuitive": self.intuitive_positions(),
+                  "emotional": self.emotional_positions()}
+        if self.logical is not None:
+            groups["logical"] = self.logical
+        seen = {}
+        for name, positions in groups.items():
+            for p in positions:
+                p %= self.protofilaments
+                if p in seen and seen[p] != name:
+                    raise ValueError(f"El protofilamento {p} está en '{seen[p]}' y en "
+                                     f"'{name}': se mediría dos veces")
+                seen[p] = name
+
+    @property
+    def num_qubits(self) -> int:
+        return self.protofilaments * self.rings
+
+    @property
+    def center(self) -> int:
+        """Protofilamento central (nodo que inicia el colapso)."""
+        return self.protofilaments // 2
+
+    def superposed_positions(self) -> tuple[int, ...]:
+        if self.superposed is None:
+            return tuple(range(round(self.protofilaments * 8 / 13)))
+        return tuple(range(self.superposed))
+
+    def phase_noise_positions(self) -> tuple[int, ...]:
+        if self.phase_noise is None:
+            return tuple(range(0, self.protofilaments, 3))
+        return self.phase_noise
+
+    def bitflip_noise_positions(self) -> tuple[int, ...]:
+        if self.bitflip_noise is None:
+            return (self.center - 1, self.center + 1)
+        return self.bitflip_noise
+
+    def intuitive_positions(self) -> tuple[int, ...]:
+        if self.intuitive is None:
+            return tuple(range(1, self.center, 2))
+        return self.intuitive
+
+    def emotional_positions(self) -> tuple[int, ...]:
+        if self.emotional is None:
+            # center + 3 (qubit 9 de 13qbits.py) o el siguiente libre
+            taken = {self.center, *self.intuitive_positions()}
+            for step in range(self.protofilaments):
+                p = (self.center + 3 + step) % self.protofilaments
+                if p not in taken:
+                    return (p,)
+            return ()
+        return self.emotional
+
+    def logical_positions(self) -> tuple[int, ...]:
+        """Resto de protofilamentos, medidos en la base Z."""
+        if self.logical is not None:
+            return self.logical
+        special = {self.center, *self.intuitive_positions(),
+                   *self.emotional_positions()}
+        return tuple(p for p in range(self.protofilaments) if p not in special)
+
+    def qubit(self, ring: int, position: int) -> int:
+        return ring * self.protofilaments + position % self.protofilaments
+
+    def chain_links(self) -> list[tuple[int, int]]:
+        """Cadena helicoidal que recorre todo el retículo."""
+        return [(q, q + 1) for q in range(self.num_qubits - 1)]
+
+    def diametral_pairs(self) -> list[tuple[int, int]]:
+        return [(self.qubit(r, p), self.qubit(r, p + self.center))
+                for r in range(self.rings)
+                for p in range(self.diametral_links)]
+
+    def longitudinal_pairs(self) -> list[tuple[int, int]]:
+        """Contactos entre anillos consecutivos a lo largo del protofilamento."""
+        return [(self.qubit(r, p), self.qubit(r + 1, p + self.helix_start))
+                for r in range(self.rings - 1)
+                for p in range(self.protofilaments)]
+
+    def per_ring(self, positions) -> list[int]:
+        return [self.qubit(r, p) for r in range(self.rings) for p in positions]
+
+
+@profiled("build")
+def build_microtubule_circuit(lattice: MicrotubuleLattice | None = None, *,
+                              measure: bool = True,
+                              feedback: bool = True,
+                              deferred: bool = False,
+                              readout: bool = True) -> QuantumCircuit:
+    """Construye el circuito Orch-OR del microtúbulo descrito por ``lattice``.
+
+    Con ``measure=False`` se omiten la reducción objetiva y las mediciones
+    neurales (útil para análisis de vector de estado); ``feedback=False``
+    elimina sólo la propagación condicional del colapso.  Con
+    ``deferred=True`` la propagación se hace con CNOT desde el protofilamento
+    central y éste se mide al final (principio de medición diferida): la
+    distribución es la misma y no hay mediciones intermedias.
+    ``readout=False`` omite la FASE 6 y deja libres los bits clásicos para
+    otra lectura (p. ej. bases aleatorias de ``shadows``).
+    """
+    lat = lattice if lattice is not None else MicrotubuleLattice()
+    n = lat.num_qubits
+    qc = QuantumCircuit(n, n) if measure else QuantumCircuit(n)
+
+    # FASE 1: Superposición inicial
+    with phase("fase_1"):
+        for q in lat.per_ring(lat.superposed_positions()):
+            qc.h(q)
+
+    # FASE 2: Entrelazamiento en cadena, diametral y entre anillos
+    with phase("fase_2"):
+        for a, b in lat.chain_links():
+            qc.cx(a, b)
+        for a, b in lat.diametral_pairs():
+            qc.cx(a, b)
+        for a, b in lat.longitudinal_pairs():
+            qc.cx(a, b)
+
+    # FASE 3: α-tubulina (pares) y β-tubulina (impares)
+    with phase("fase_3"):
+        for q in lat.per_ring(range(0, lat.protofilaments, 2)):
+            qc.rz(lat.alpha_angle, q)
+        for q in lat.per_ring(range(1, lat.protofilaments, 2)):
+            qc.ry(lat.beta_angle, q)
+
+    # FASE 4: Decoherencia térmica
+    with phase("fase_4"):
+        for q in lat.per_ring(lat.phase_noise_positions()):
+            qc.z(q)
+        for q in lat.per_ring(lat.bitflip_noise_positions()):
+            qc.x(q)
+
+    if not measure:
+        return qc
+
+    # FASE 5: Reducción objetiva desde el protofilamento central
+    with phase("fase_5"):
+        neighbours = (lat.center - 1, lat.center + 1)
+        for r in range(lat.rings):
+            c = lat.qubit(r, lat.center)
+            if deferred:
+                if feedback:
+                    for p in neighbours:
+                        qc.cx(c, lat.qubit(r, p))
+                continue
+            qc.measure(c, c)
+            if feedback:
+                with qc.if_test((qc.clbits[c], 1)):
+                    for p in neighbours:
+                        qc.x(lat.qubit(r, p))
+
+    if not readout:
+        return qc
+
+    # FASE 6: Mediciones en diferentes "bases neurales"
+    with phase("fase_6"):
+        for q in lat.per_ring(lat.intuitive_positions()):
+            qc.h(q)
+            qc.measure(q, q)
+        for q in lat.per_ring(lat.emotional_positions()):
+            qc.ry(np.pi / 2, q)
+            qc.measure(q, q)
+        for q in lat.per_ring(lat.logical_positions()):
+            qc.measure(q, q)
+        if deferred:
+            for q in lat.per_ring([lat.center]):
+                qc.measure(q, q)
+
+    return qc
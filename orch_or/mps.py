@@ -0,0 +1,135 @@
+# =============================================================================
+# RETÍCULOS LARGOS (100-1000 DÍMEROS) CON MATRIX PRODUCT STATES
+# =============================================================================
+#
+# La topología del microtúbulo es casi una cadena de vecinos más unas pocas
+# conexiones diametrales y longitudinales, así que su entrelazamiento es bajo
+# y el método matrix_product_state de Aer la simula con memoria lineal en el
+# número de qubits.  La dimensión de enlace se puede truncar y el error
+# descartado se lee del registro MPS de Aer.
+
+from __future__ import annotations
+
+import heapq
+import multiprocessing
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+from qiskit_aer import AerSimulator
+
+from .analysis import consciousness_metrics
+from .microtubule import MicrotubuleLattice, build_microtubule_circuit
+from .profiling import phase, record_aer
+
+_DISCARDED = re.compile(r"discarded_value=([0-9.eE+-]+)")
+_BOND_DIMS = re.compile(r"BD=\[([0-9 ]+)\]")
+
+# El registro MPS crece como (compuertas x qubits); por encima de este tamaño
+# sólo se guarda si se pide explícitamente
+LOG_MAX_QUBITS = 256
+
+
+def truncation_report(log: str) -> dict:
+    """Error de truncamiento y dimensión de enlace máxima del MPS_log_data."""
+    discarded = np.array([float(v) for v in _DISCARDED.findall(log)])
+    max_bond = max((max(map(int, dims.split())) for dims in _BOND_DIMS.findall(log)),
+                   default=1)
+    return {
+        "truncations": len(discarded),
+        "truncation_error": float(discarded.sum()),
+        "fidelity_estimate": float(np.prod(1.0 - discarded)),
+        "max_bond_dimension": max_bond,
+    }
+
+
+def ring_metrics(counts: dict, lattice: MicrotubuleLattice, top: int = 5) -> list[dict]:
+    """Métricas de 13qbits.py para el patrón de cada anillo por separado."""
+    n, p = lattice.num_qubits, lattice.protofilaments
+    items = [(k.replace(" ", ""), v) for k, v in counts.items()]
+    metrics = []
+    for r in range(lattice.rings):
+        # El bit clásico 0 está a la derecha de la cadena
+        segment = Counter()
+        for bitstring, count in items:
+            segment[bitstring[n - (r + 1) * p:n - r * p]] += count
+        best = heapq.nlargest(top, segment.items(), key=lambda item: item[1])
+        metrics.append({**consciousness_metrics(segment, p), "top": best})
+    return metrics
+
+
+def ones_probability(counts: dict, num_bits: int) -> np.ndarray:
+    """Probabilidad de medir 1 en cada bit clásico."""
+    keys = [k.replace(" ", "") for k in counts]
+    bits = np.frombuffer("".join(keys).encode(), dtype=np.uint8).reshape(len(keys), num_bits)
+    weights = np.fromiter(counts.values(), dtype=float, count=len(keys))
+    return ((bits == ord("1")).T @ weights / weights.sum())[::-1]
+
+
+def _simulate(qc, shots: int, seed: int | None, options: dict):
+    simulator = AerSimulator(method="matrix_product_state", **options)
+    return simulator.run(qc, shots=shots, seed_simulator=seed).result()
+
+
+def _simulate_isolated(qc, shots: int, seed: int | None, options: dict):
+    """``_simulate`` en un proceso hijo: un fallo de Aer no tumba al llamador."""
+    with ProcessPoolExecutor(max_workers=1,
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        try:
+            return pool.submit(_simulate, qc, shots, seed, options).result()
+        except BrokenProcessPool as exc:
+            raise RuntimeError(
+                "Aer terminó abruptamente simulando el MPS (p. ej. SIGSEGV); "
+                "pruebe otra max_bond_dimension") from exc
+
+
+def run_mps(lattice: MicrotubuleLattice | None = None, *, shots: int = 1024,
+            max_bond_dimension: int | None = None,
+            truncation_threshold: float = 1e-16, seed: int | None = None,
+            log_truncation: bool | None = None, isolate: bool | None = None) -> dict:
+    """Simula el protocolo completo del retículo con Aer matrix_product_state.
+
+    ``max_bond_dimension`` limita χ (None = sin límite).  El informe de
+    truncamiento requiere ``log_truncation``, que guarda el registro MPS
+    (por defecto sólo hasta LOG_MAX_QUBITS qubits).
+
+    Aer 0.17 termina el intérprete con SIGSEGV al truncar algunos retículos
+    apilados (p. ej. 13 protofilamentos, 16 o más anillos y χ = 4; χ = 3, 5
+    o 6 funcionan), así que con ``isolate`` la simulación corre en un
+    proceso hijo y ese fallo se convierte en ``RuntimeError``.  Por defecto
+    se aísla siempre que se trunca (``max_bond_dimension`` dado), a cambio
+    de arrancar un proceso nuevo.
+    """
+    lattice = lattice if lattice is not None else MicrotubuleLattice()
+    if log_truncation is None:
+        log_truncation = lattice.num_qubits <= LOG_MAX_QUBITS
+    # Medición diferida: sin mediciones intermedias todos los shots se
+    # muestrean de un único MPS final
+    qc = build_microtubule_circuit(lattice, deferred=True)
+    options = {
+        "matrix_product_state_truncation_threshold": truncation_threshold,
+        "mps_log_data": log_truncation,
+    }
+    if max_bond_dimension is not None:
+        options["matrix_product_state_max_bond_dimension"] = max_bond_dimension
+    if isolate is None:
+        isolate = max_bond_dimension is not None
+    with phase("simulate", method="matrix_product_state", isolated=isolate):
+        result = (_simulate_isolated if isolate else _simulate)(qc, shots, seed, options)
+        record_aer(result)
+    with phase("get_counts"):
+        counts = result.get_counts(0)
+    metadata = result.results[0].metadata
+
+    report = {
+        "num_qubits": lattice.num_qubits,
+        "rings": ring_metrics(counts, lattice),
+        "ones_probability": ones_probability(counts, qc.num_clbits),
+        "time_taken": result.results[0].time_taken,
+        "counts": counts,
+    }
+    if log_truncation:
+        report.update(truncation_report(metadata.get("MPS_log_data", "")))
+    return report
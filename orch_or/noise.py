@@ -0,0 +1,228 @@
+# =============================================================================
+# MODELO DE RUIDO FÍSICO (T1/T2, 37°C) Y SELECCIÓN DEL MÉTODO DE AER
+# =============================================================================
+#
+# En lugar de las compuertas z/x/y deterministas de la fase de decoherencia,
+# cada compuerta va seguida de un canal de relajación térmica con los T1/T2
+# de la tubulina correspondiente (α en posiciones pares, β en impares, como
+# en el constructor del microtúbulo).  La población excitada de equilibrio
+# sale de la distribución de Boltzmann a la temperatura indicada.
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit_aer import AerSimulator
+from qiskit_aer.noise import NoiseModel, ReadoutError, thermal_relaxation_error
+
+from .microtubule import MicrotubuleLattice, build_microtubule_circuit
+from .profiling import phase, record_aer
+
+logger = logging.getLogger(__name__)
+
+PLANCK = 6.62607015e-34     # J·s
+BOLTZMANN = 1.380649e-23    # J/K
+BODY_TEMPERATURE = 310.15   # 37°C en kelvin
+
+ONE_QUBIT_GATES = ["h", "x", "y", "z", "rx", "ry", "rz"]
+CLIFFORD_GATES = {"h", "x", "y", "z", "s", "sdg", "cx", "cz", "swap", "id"}
+NON_GATES = {"measure", "barrier", "reset", "delay"}
+
+# Memoria máxima para un vector o matriz densidad completos (bytes)
+MEMORY_BUDGET = 8 * 2**30
+
+
+@dataclass(frozen=True)
+class TubulinNoise:
+    """Tiempos de relajación de un tipo de tubulina (µs)."""
+
+    t1: float
+    t2: float
+    readout: float = 0.0    # Probabilidad de error de lectura
+
+    def __post_init__(self):
+        if self.t2 > 2 * self.t1:
+            raise ValueError("T2 no puede superar 2·T1")
+
+
+@dataclass(frozen=True)
+class NoiseConfig:
+    """Parámetros físicos del ruido térmico del microtúbulo."""
+
+    alpha: TubulinNoise = field(default_factory=lambda: TubulinNoise(t1=100.0, t2=80.0))
+    beta: TubulinNoise = field(default_factory=lambda: TubulinNoise(t1=60.0, t2=40.0))
+    temperature: float = BODY_TEMPERATURE   # K
+    frequency: float = 5e9                  # Hz, separación de niveles del qubit
+    gate_time: float = 0.05                 # µs, compuertas de un qubit
+    cx_time: float = 0.3                    # µs, CNOT
+
+    def excited_population(self) -> float:
+        """Población térmica de |1⟩ a ``temperature`` (Boltzmann)."""
+        if self.temperature <= 0:
+            return 0.0
+        ratio = PLANCK * self.frequency / (BOLTZMANN * self.temperature)
+        return float(1.0 / (1.0 + np.exp(ratio)))
+
+    def tubulin(self, qubit: int, protofilaments: int | None = None) -> TubulinNoise:
+        """α en posiciones pares de su anillo y β en impares, como el constructor."""
+        position = qubit % protofilaments if protofilaments else qubit
+        return self.alpha if position % 2 == 0 else self.beta
+
+
+def cx_pairs(qc: QuantumCircuit) -> set[tuple[int, int]]:
+    """Pares (control, objetivo) de las CNOT del circuito."""
+    return {tuple(qc.find_bit(q).index for q in ci.qubits)
+            for ci in qc.data if ci.operation.name == "cx"}
+
+
+def build_noise_model(config: NoiseConfig, num_qubits: int,
+                      pairs=None, protofilaments: int | None = None) -> NoiseModel:
+    """NoiseModel de relajación térmica por qubit según su tubulina.
+
+    ``pairs`` limita los errores de CNOT a esos pares (por defecto todos los
+    pares ordenados, que crecen como n²).  ``protofilaments`` da la posición
+    de cada qubit dentro de su anillo (por defecto un solo anillo).
+    """
+    population = config.excited_population()
+    model = NoiseModel(basis_gates=ONE_QUBIT_GATES + ["cx"])
+
+    def relaxation(qubit, time):
+        tub = config.tubulin(qubit, protofilaments)
+        return thermal_relaxation_error(tub.t1, tub.t2, time, population)
+
+    for q in range(num_qubits):
+        model.add_quantum_error(relaxation(q, config.gate_time), ONE_QUBIT_GATES, [q])
+        readout = config.tubulin(q, protofilaments).readout
+        if readout > 0:
+            model.add_readout_error(
+                ReadoutError([[1 - readout, readout], [readout, 1 - readout]]), [q])
+    if pairs is None:
+        pairs = [(a, b) for a in range(num_qubits) for b in range(num_qubits) if a != b]
+    for a, b in pairs:
+        # El primer qubit de qargs es el de la derecha en tensor()
+        error = relaxation(b, config.cx_time).tensor(relaxation(a, config.cx_time))
+        model.add_quantum_error(error, ["cx"], [a, b])
+    return model
+
+
+# rz(m·π/2) = S^m salvo fase global; rx y ry se reducen a rz cambiando de base
+_RZ_QUARTERS = ((), ("s",), ("z",), ("sdg",))
+_BASIS_CHANGE = {"rz": ((), ()), "rx": (("h",), ("h",)), "ry": (("sdg", "h"), ("h", "s"))}
+
+
+def clifford_circuit(qc: QuantumCircuit) -> QuantumCircuit | None:
+    """``qc`` sólo con las compuertas de CLIFFORD_GATES, o None si no es Clifford.
+
+    Las rotaciones rx/ry/rz en múltiplos de π/2 se reescriben con h/s/sdg/z
+    (el método stabilizer de Aer no acepta rx ni ry aunque el ángulo sea
+    Clifford); la fase global descartada no cambia ninguna distribución.
+    """
+    out = qc.copy_empty_like()
+    for ci in qc.data:
+        op = ci.operation
+        if op.name in NON_GATES or op.name in CLIFFORD_GATES:
+            out.append(ci)
+        elif op.name == "if_else":
+            blocks = [clifford_circuit(block) for block in op.blocks]
+            if any(block is None for block in blocks):
+                return None
+            out.append(ci.replace(operation=op.replace_blocks(blocks)))
+        elif op.name in _BASIS_CHANGE:
+            try:
+                angle = float(op.params[0])
+            except TypeError:   # Parameter sin asignar
+                return None
+            quarters = angle / (np.pi / 2)
+            if not np.isclose(quarters, np.round(quarters)):
+                return None
+            before, after = _BASIS_CHANGE[op.name]
+            for name in before + _RZ_QUARTERS[int(np.round(quarters)) % 4] + after:
+                getattr(out, name)(ci.qubits[0])
+        else:
+            return None
+    return out
+
+
+def _is_clifford(qc: QuantumCircuit) -> bool:
+    return clifford_circuit(qc) is not None
+
+
+def _pauli_noise_only(noise_model: NoiseModel | None) -> bool:
+    """Cierto si todos los errores son mezclas de Paulis (válidos en stabilizer)."""
+    if noise_model is None or noise_model.is_ideal():
+        return True
+    pauli = {"id", "x", "y", "z", "pauli"}
+    return all(instruction["name"] in pauli
+               for error in noise_model.to_dict()["errors"]
+               if error["type"] == "qerror"
+               for circuit in error["instructions"]
+               for instruction in circuit)
+
+
+def select_method(qc: QuantumCircuit, noise_model: NoiseModel | None = None,
+                  shots: int = 1024, memory_budget: int = MEMORY_BUDGET) -> dict:
+    """Método de AerSimulator más barato que simula ``qc`` correctamente.
+
+    Devuelve el método, la memoria estimada en bytes y el motivo, y lo
+    registra en el logger del módulo.
+    """
+    n = qc.num_qubits
+    noisy = noise_model is not None and not noise_model.is_ideal()
+    statevector_bytes = 16 * 2**n
+    density_bytes = 16 * 4**n
+
+    if _is_clifford(qc) and _pauli_noise_only(noise_model):
+        choice = ("stabilizer", 2 * n * (2 * n + 1) // 8,
+                  "circuito Clifford con ruido de Pauli")
+    elif statevector_bytes > memory_budget:
+        choice = ("matrix_product_state", None,
+                  f"2^{n} amplitudes superan el presupuesto de memoria")
+    elif noisy and density_bytes <= memory_budget and 2**n <= shots:
+        choice = ("density_matrix", density_bytes,
+                  f"ruido con 4^{n} <= {shots} shots x 2^{n}")
+    elif noisy:
+        choice = ("statevector", statevector_bytes,
+                  "ruido muestreado por trayectoria en cada shot")
+    else:
+        choice = ("statevector", statevector_bytes, "circuito ideal no Clifford")
+
+    method, memory, reason = choice
+    logger.info("Método Aer: %s (%d qubits, memoria estimada %s bytes): %s",
+                method, n, memory if memory is not None else "O(n·χ²)", reason)
+    return {"method": method, "memory_bytes": memory, "reason": reason}
+
+
+def noisy_simulator(qc: QuantumCircuit, config: NoiseConfig | None = None, *,
+                    shots: int = 1024, protofilaments: int | None = None,
+                    **options) -> AerSimulator:
+    """AerSimulator con el modelo de ruido físico y el método elegido.
+
+    ``protofilaments`` (de la red) sitúa α/β dentro de cada anillo.
+
+    Si el método es "stabilizer" hay que ejecutar ``clifford_circuit(qc)``
+    en lugar de ``qc``.
+    """
+    config = config if config is not None else NoiseConfig()
+    noise_model = build_noise_model(config, qc.num_qubits, cx_pairs(qc), protofilaments)
+    choice = select_method(qc, noise_model, shots=shots)
+    return AerSimulator(method=choice["method"], noise_model=noise_model, **options)
+
+
+def run_noisy(lattice: MicrotubuleLattice | None = None,
+              config: NoiseConfig | None = None, *,
+              shots: int = 2048, seed: int | None = None) -> dict:
+    """Simula el microtúbulo con ruido físico en vez de compuertas de error fijas."""
+    lattice = lattice if lattice is not None else MicrotubuleLattice()
+    qc = build_microtubule_circuit(replace(lattice, phase_noise=(), bitflip_noise=()))
+    simulator = noisy_simulator(qc, config, shots=shots,
+                                protofilaments=lattice.protofilaments)
+    if simulator.options.method == "stabilizer":
+        qc = clifford_circuit(qc)
+    with phase("simulate", noisy=True):
+        result = simulator.run(qc, shots=shots, seed_simulator=seed).result()
+        record_aer(result)
+    with phase("get_counts"):
+        return result.get_counts(0)
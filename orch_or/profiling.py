@@ -0,0 +1,193 @@
+# =============================================================================
+# INSTRUMENTACIÓN POR FASES: TIEMPO, CPU, MEMORIA Y METADATOS DE AER
+# =============================================================================
+#
+# ``phase(nombre)`` (gestor de contexto) y ``@profiled(nombre)`` (decorador)
+# miden tiempo de pared, tiempo de CPU y memoria residente de cada fase
+# (FASE 1-6 del constructor, simulate, get_counts, analyze, render...) y
+# envían un registro a cada sink activo.  Un sink es cualquier invocable que
+# recibe el diccionario del registro: ``log_sink``, ``JsonLinesSink`` o una
+# función propia.
+#
+# Sin sinks la instrumentación está desactivada: ``phase`` devuelve un
+# contexto vacío compartido y ``profiled`` llama directamente a la función.
+# ORCH_OR_PROFILE=log o ORCH_OR_PROFILE=<archivo.jsonl> la activa al
+# importar el módulo (útil para los scripts); la CLI acepta --profile.
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:     # Sólo se pierde la memoria residente actual
+    psutil = None
+try:
+    import resource
+except ImportError:     # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ENV = "ORCH_OR_PROFILE"
+
+_sinks: list = []
+_local = threading.local()
+_NULL = contextlib.nullcontext()
+_process = psutil.Process() if psutil is not None else None
+
+
+def _rss() -> int | None:
+    return _process.memory_info().rss if _process is not None else None
+
+
+def _peak_rss() -> int | None:
+    """Pico de memoria residente del proceso desde su inicio, en bytes."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    if _process is not None:
+        return getattr(_process.memory_info(), "peak_wset", None)
+    return None
+
+
+def _stack() -> list:
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+class _Phase:
+    def __init__(self, name: str, labels: dict):
+        self.record = {"name": name, **labels}
+
+    def __enter__(self):
+        stack = _stack()
+        self.record["path"] = "/".join([p.record["name"] for p in stack] + [self.record["name"]])
+        stack.append(self)
+        self._rss = _rss()
+        self._cpu = time.process_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        _stack().pop()
+        rss = _rss()
+        self.record.update({
+            "timestamp": time.time(),
+            "wall": wall,
+            "cpu": cpu,
+            "rss": rss,
+            "rss_delta": rss - self._rss if rss is not None else None,
+            "peak_rss": _peak_rss(),
+        })
+        if exc[0] is not None:
+            self.record["error"] = exc[0].__name__
+        for sink in _sinks:
+            sink(self.record)
+
+
+def phase(name: str, **labels):
+    """Contexto que mide la fase ``name`` (vacío si no hay sinks)."""
+    if not _sinks:
+        return _NULL
+    return _Phase(name, labels)
+
+
+def profiled(name: str | None = None, **labels):
+    """Decorador que mide cada llamada como la fase ``name``."""
+    def decorator(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _sinks:
+                return fn(*args, **kwargs)
+            with _Phase(label, labels):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_aer(result):
+    """Añade los metadatos de un Result de Aer a la fase activa."""
+    stack = _stack() if _sinks else None
+    if not stack:
+        return
+    experiments = [{
+        "method": r.metadata.get("method"),
+        "device": r.metadata.get("device"),
+        "time_taken": r.time_taken,
+        "parallel_shots": r.metadata.get("parallel_shots"),
+        "parallel_state_update": r.metadata.get("parallel_state_update"),
+        "required_memory_mb": r.metadata.get("required_memory_mb"),
+        "shots": r.shots,
+    } for r in result.results]
+    stack[-1].record["aer"] = {
+        "time_taken": result.time_taken,
+        "omp_enabled": result.metadata.get("omp_enabled"),
+        "parallel_experiments": result.metadata.get("parallel_experiments"),
+        "max_memory_mb": result.metadata.get("max_memory_mb"),
+        "experiments": experiments,
+    }
+
+
+def log_sink(log: logging.Logger | None = None, level: int = logging.INFO):
+    """Sink que escribe una línea de log por fase."""
+    log = log if log is not None else logger
+
+    def sink(record):
+        log.log(level, "%s: %.4f s pared, %.4f s CPU, RSS %s", record["path"],
+                record["wall"], record["cpu"], record["rss"])
+    return sink
+
+
+class JsonLinesSink:
+    """Sink que añade cada registro como una línea JSON a ``path``."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, record):
+        line = json.dumps(record, default=str, ensure_ascii=False)
+        with self._lock, open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(line + "\n")
+
+
+def enable(*sinks):
+    """Activa la instrumentación con ``sinks`` (se suman a los activos)."""
+    _sinks.extend(sinks)
+
+
+def disable():
+    _sinks.clear()
+
+
+def enabled() -> bool:
+    return bool(_sinks)
+
+
+def configure(target: str):
+    """Activa un sink a partir de ``"log"`` o de la ruta de un archivo JSON lines."""
+    if target == "log":
+        # Sólo el logger de este módulo: sin activar el INFO de qiskit
+        if not logger.handlers:
+            logger.addHandler(logging.StreamHandler())
+            logger.setLevel(logging.INFO)
+        enable(log_sink())
+    else:
+        enable(JsonLinesSink(target))
+
+
+if os.environ.get(PROFILE_ENV):
+    configure(os.environ[PROFILE_ENV])
@@ -0,0 +1,219 @@
+# =============================================================================
+# SOMBRAS CLÁSICAS: MEDICIONES EN BASES DE PAULI ALEATORIAS
+# =============================================================================
+#
+# En lugar de las bases neurales fijas de la FASE 6 (X en los intuitivos, Y en
+# el emocional, Z en el resto) cada qubit se mide en una base de Pauli elegida
+# al azar.  La rotación de base es una capa de compuertas ``u`` parametrizadas
+# añadida al circuito transpilado, así que todas las bases aleatorias se
+# envían a Aer en un único trabajo mediante ``parameter_binds``.
+#
+# De las instantáneas (base, resultado) se estiman vectores de Bloch,
+# correladores de dos puntos y purezas / entropías de Rényi-2 de subsistemas.
+# El coste crece con el número de instantáneas y de observables pedidos, no
+# con 2^n: no se reconstruye ninguna matriz densidad completa.
+
+from __future__ import annotations
+
+import itertools
+
+import numpy as np
+from qiskit import ClassicalRegister, QuantumCircuit, transpile
+from qiskit.circuit import Parameter
+from qiskit_aer import AerSimulator
+
+from .cache import TranspileCache
+from .microtubule import MicrotubuleLattice, build_microtubule_circuit
+from .profiling import phase, record_aer
+
+PAULIS = "XYZ"
+
+# Ángulos (θ, λ) de u(θ, 0, λ) que llevan la base X, Y o Z a la base Z
+_ROTATIONS = np.array([[np.pi / 2, np.pi],
+                       [np.pi / 2, np.pi / 2],
+                       [0.0, 0.0]])
+
+# Tr(ρ̂_s ρ̂_t) de un qubit con ρ̂ = 3 U†|b⟩⟨b|U - I, indexado por 2·base + bit
+_SAME, _FLIP, _OTHER = 5.0, -4.0, 0.5
+_KERNEL = np.where(np.equal.outer(np.arange(6) // 2, np.arange(6) // 2),
+                   np.where(np.equal.outer(np.arange(6), np.arange(6)), _SAME, _FLIP),
+                   _OTHER)
+
+
+class ClassicalShadow:
+    """Instantáneas de mediciones en bases de Pauli aleatorias.
+
+    ``bases`` tiene forma (B, n) con 0/1/2 = X/Y/Z por qubit y ``outcomes``
+    forma (B, S, n) con el bit medido (0 = autovalor +1) de cada uno de los
+    ``S`` shots de cada base.
+    """
+
+    def __init__(self, bases, outcomes):
+        self.bases = np.asarray(bases, dtype=np.int8)
+        self.outcomes = np.asarray(outcomes, dtype=np.uint8)
+        if self.outcomes.ndim != 3 or self.outcomes.shape[::2] != self.bases.shape:
+            raise ValueError("outcomes debe tener forma (bases, shots, qubits)")
+
+    @property
+    def num_qubits(self) -> int:
+        return self.bases.shape[1]
+
+    @property
+    def num_snapshots(self) -> int:
+        return self.outcomes.shape[0] * self.outcomes.shape[1]
+
+    def _estimators(self, qubits=slice(None)) -> np.ndarray:
+        """3·signo·[base == P] por instantánea, qubit y Pauli: (N, q, 3)."""
+        signs = 1.0 - 2.0 * self.outcomes[:, :, qubits]
+        onehot = self.bases[:, None, qubits, None] == np.arange(3)
+        return (3.0 * signs[..., None] * onehot).reshape(-1, signs.shape[-1], 3)
+
+    def bloch_vectors(self) -> np.ndarray:
+        """Vectores de Bloch estimados, forma (n, 3)."""
+        mean_signs = 1.0 - 2.0 * self.outcomes.mean(axis=1)
+        onehot = self.bases[..., None] == np.arange(3)
+        return 3.0 * np.mean(mean_signs[..., None] * onehot, axis=0)
+
+    def correlators(self, pairs=None) -> np.ndarray:
+        """Correladores ⟨P_i Q_j⟩ estimados.
+
+        Sin ``pairs`` devuelve la matriz (n, n, 3, 3) de todos los pares (los
+        bloques diagonales i == j son la identidad); con una lista de pares
+        ``(i, j)`` devuelve sólo esos, forma (P, 3, 3).
+        """
+        if pairs is not None:
+            pairs = np.asarray(list(pairs), dtype=np.intp).reshape(-1, 2)
+            first = self._estimators(pairs[:, 0])
+            second = self._estimators(pairs[:, 1])
+            return np.einsum("spa,spb->pab", first, second) / len(first)
+        n = self.num_qubits
+        flat = self._estimators().reshape(-1, 3 * n)
+        corr = (flat.T @ flat / len(flat)).reshape(n, 3, n, 3).transpose(0, 2, 1, 3)
+        corr[np.arange(n), np.arange(n)] = np.eye(3)
+        return corr
+
+    def purity(self, subsystem) -> float:
+        """Pureza Tr(ρ_A²) del subsistema ``subsystem`` (estimador insesgado).
+
+        Promedia Tr(ρ̂_s ρ̂_t) sobre pares de instantáneas de bases aleatorias
+        distintas; los pares de una misma base no son independientes y se
+        excluyen.  El coste es cuadrático en el número de patrones distintos
+        del subsistema, acotado por 6^|A|.
+        """
+        qubits = np.asarray(subsystem, dtype=np.intp).reshape(-1)
+        num_bases, shots = self.outcomes.shape[:2]
+        if num_bases < 2:
+            raise ValueError("Se necesitan al menos dos bases aleatorias")
+        codes = (2 * self.bases[:, None, qubits] + self.outcomes[:, :, qubits]).reshape(-1, len(qubits))
+        draw = np.repeat(np.arange(num_bases), shots)
+
+        def pair_sum(rows, weights):
+            gram = np.ones((len(rows), len(rows)))
+            for column in rows.T:
+                gram *= _KERNEL[np.ix_(column, column)]
+            return weights @ gram @ weights
+
+        patterns, counts = np.unique(codes, axis=0, return_counts=True)
+        total = pair_sum(patterns, counts)
+        # Pares dentro de una misma base
+        keyed, counts = np.unique(np.column_stack([draw, codes]), axis=0, return_counts=True)
+        bounds = np.flatnonzero(np.diff(keyed[:, 0])) + 1
+        for rows, weights in zip(np.split(keyed[:, 1:], bounds), np.split(counts, bounds)):
+            total -= pair_sum(rows, weights)
+        return float(total / (self.num_snapshots**2 - num_bases * shots**2))
+
+    def renyi_entropy(self, subsystem) -> float:
+        """Entropía de Rényi-2 -log2 Tr(ρ_A²), con la pureza acotada a [2^-|A|, 1]."""
+        k = np.asarray(subsystem).size
+        return float(np.log2(1.0 / np.clip(self.purity(subsystem), 2.0**-k, 1.0)))
+
+    def summary(self, subsystems=None) -> dict:
+        """Bloch, correladores y purezas (por defecto de cada qubit y par vecino)."""
+        n = self.num_qubits
+        if subsystems is None:
+            subsystems = [(q,) for q in range(n)] + list(itertools.pairwise(range(n)))
+        purities = np.array([self.purity(s) for s in subsystems])
+        return {
+            "bloch": self.bloch_vectors(),
+            "correlators": self.correlators(),
+            "subsystems": [tuple(s) for s in subsystems],
+            "purity": purities,
+            "renyi_entropy": np.log2(1.0 / np.clip(
+                purities, [2.0**-len(s) for s in subsystems], 1.0)),
+        }
+
+
+def random_bases(num_bases: int, num_qubits: int, seed=None) -> np.ndarray:
+    """Bases de Pauli uniformes (0/1/2 = X/Y/Z), forma (num_bases, num_qubits)."""
+    return np.random.default_rng(seed).integers(0, 3, size=(num_bases, num_qubits),
+                                                dtype=np.int8)
+
+
+def append_basis_layer(circuit: QuantumCircuit) -> tuple[QuantumCircuit, list, list]:
+    """Añade la rotación de base parametrizada y la medición de cada qubit.
+
+    Devuelve el circuito y los Parameters θ y λ de cada qubit.  Si el
+    circuito no tiene bits clásicos se añade un registro de n bits.
+    """
+    qc = circuit.copy()
+    n = qc.num_qubits
+    if qc.num_clbits == 0:
+        qc.add_register(ClassicalRegister(n))
+    elif qc.num_clbits != n:
+        raise ValueError("El circuito debe tener 0 o un bit clásico por qubit")
+    thetas = [Parameter(f"θ_sombra[{q}]") for q in range(n)]
+    lambdas = [Parameter(f"λ_sombra[{q}]") for q in range(n)]
+    for q in range(n):
+        qc.u(thetas[q], 0.0, lambdas[q], q)
+    for q in range(n):
+        qc.measure(q, q)
+    return qc, thetas, lambdas
+
+
+def classical_shadow(lattice: MicrotubuleLattice | None = None, *,
+                     circuit: QuantumCircuit | None = None,
+                     num_bases: int = 200, shots_per_basis: int = 10,
+                     seed: int | None = None,
+                     simulator: AerSimulator | None = None,
+                     cache: TranspileCache | None = None) -> ClassicalShadow:
+    """Mide ``num_bases`` bases de Pauli aleatorias en un único trabajo Aer.
+
+    Por defecto mide el estado del microtúbulo justo antes de la FASE 6
+    (``readout=False``); ``circuit`` permite cualquier circuito sin
+    mediciones finales.  Con matrix_product_state la reducción objetiva se
+    difiere, como en ``run_mps``, y el protofilamento central queda sin
+    colapsar; el resto de qubits tiene el mismo estado reducido.
+
+    Cada base es un experimento de Aer con un coste fijo de algunos ms, así
+    que varios shots por base abaratan las instantáneas; los estimadores
+    siguen siendo insesgados.
+    """
+    simulator = simulator if simulator is not None else AerSimulator()
+    if circuit is None:
+        lattice = lattice if lattice is not None else MicrotubuleLattice()
+        if simulator.options.method == "matrix_product_state":
+            # Sin transpilar, como run_mps: el retículo supera el ancho del Target
+            tqc = build_microtubule_circuit(lattice, readout=False, deferred=True)
+        elif cache is not None:
+            tqc = cache.get_or_build(lattice, simulator, readout=False)
+        else:
+            tqc = transpile(build_microtubule_circuit(lattice, readout=False), simulator)
+    else:
+        tqc = transpile(circuit, simulator)
+    # u y measure son nativas de Aer: la capa se añade ya transpilada
+    qc, thetas, lambdas = append_basis_layer(tqc)
+
+    bases = random_bases(num_bases, qc.num_qubits, seed)
+    angles = _ROTATIONS[bases]
+    binds = {**{p: angles[:, q, 0] for q, p in enumerate(thetas)},
+             **{p: angles[:, q, 1] for q, p in enumerate(lambdas)}}
+    with phase("simulate", bases=num_bases):
+        result = simulator.run(qc, shots=shots_per_basis, parameter_binds=[binds],
+                               memory=True, seed_simulator=seed).result()
+        record_aer(result)
+    with phase("get_memory"):
+        memory = "".join("".join(result.get_memory(i)) for i in range(num_bases))
+    # El bit clásico 0 está a la derecha de cada cadena
+    bits = np.frombuffer(memory.encode(), dtype=np.uint8) - ord("0")
+    outcomes = bits.reshape(num_bases, shots_per_basis, qc.num_qubits)[..., ::-1]
+    return ClassicalShadow(bases, outcomes)
@@ -0,0 +1,206 @@
+# =============================================================================
+# DESCOMPOSICIÓN ESPECTRAL EN CACHÉ Y EVOLUCIÓN DE LOTES DE ESTADOS
+# =============================================================================
+#
+# H_total no depende del tiempo, así que psi(t) = V e^{-iEt} V† psi0 para
+# cualquier estado inicial y tiempo una vez conocidos E y V.  Hasta
+# DENSE_MAX_QUBITS se diagonaliza H completo con eigh; por encima se usa una
+# base de Krylov por bloques generada por el lote de estados iniciales y los
+# pares de Ritz de H proyectado en ella.  La descomposición se guarda en
+# disco (.npz) con una clave derivada de ε, J y γ, de modo que explorar
+# condiciones iniciales cuesta un producto de matrices.  La base de Krylov
+# sólo representa bien los estados que la generaron, así que por encima de
+# DENSE_MAX_QUBITS la caché es por lote de estados iniciales.
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+from qiskit.quantum_info import Statevector
+
+from .cache import DiskLRU
+from .hamiltonian import initial_state, microtubule_hamiltonian
+from .microtubule import MicrotubuleLattice, build_microtubule_circuit
+
+DEFAULT_DIRECTORY = Path(os.environ.get(
+    "ORCH_OR_SPECTRA", Path.home() / ".cache" / "orch_or" / "spectra"))
+
+DENSE_MAX_QUBITS = 12
+
+
+def _batch(psi0s) -> tuple[np.ndarray, bool]:
+    """Estados iniciales como (B, 2^N); indica si la entrada era un solo estado."""
+    if isinstance(psi0s, Statevector) or np.ndim(getattr(psi0s, "data", psi0s)) == 1:
+        return np.asarray(getattr(psi0s, "data", psi0s), dtype=complex)[None], True
+    return np.array([np.asarray(getattr(p, "data", p), dtype=complex) for p in psi0s]), False
+
+
+class Spectrum:
+    """Pares (energía, vector) de H: completos (eigh) o de Ritz (Krylov).
+
+    ``residuals[j]`` = ||H v_j - E_j v_j||, nulo para la descomposición
+    exacta; acota el error de la evolución con ``error_bound``.
+    """
+
+    def __init__(self, energies, vectors, residuals=None):
+        self.energies = np.asarray(energies, dtype=float)
+        self.vectors = np.asarray(vectors, dtype=complex)
+        self.residuals = (np.zeros_like(self.energies) if residuals is None
+                          else np.asarray(residuals, dtype=float))
+
+    def coefficients(self, psi0s) -> np.ndarray:
+        """V† psi0 de cada estado del lote, forma (K, B)."""
+        return self.vectors.conj().T @ _batch(psi0s)[0].T
+
+    def evolve(self, psi0s, times, states=None) -> np.ndarray:
+        """psi(t) de todo el lote en todos los tiempos, forma (B, T, 2^N).
+
+        Con un solo estado la forma es (T, 2^N), como ``hamiltonian.evolve``;
+        con ``states`` sólo se calculan esas amplitudes de la base
+        computacional.
+        """
+        batch, single = _batch(psi0s)
+        coefficients = self.vectors.conj().T @ batch.T
+        phases = np.exp(-1j * np.outer(np.asarray(times, dtype=float), self.energies))
+        rows = self.vectors if states is None else self.vectors[np.asarray(states)]
+        out = np.moveaxis(rows @ (phases[:, :, None] * coefficients), -1, 0)
+        return out[0] if single else out
+
+    def error_bound(self, psi0s, times) -> np.ndarray:
+        """Cota (holgada) t · Σ_j |c_j| r_j del error de ``evolve``, forma (B, T)."""
+        weight = np.abs(self.coefficients(psi0s)).T @ self.residuals
+        return np.outer(weight, np.abs(np.asarray(times, dtype=float)))
+
+    def save(self, file):
+        """Guarda energías, vectores y residuos en un .npz (ruta o archivo abierto)."""
+        np.savez(file, energies=self.energies, vectors=self.vectors,
+                 residuals=self.residuals)
+
+    @classmethod
+    def load(cls, file) -> Spectrum:
+        with np.load(file) as data:
+            return cls(data["energies"], data["vectors"], data["residuals"])
+
+
+def _orthonormal(block: np.ndarray, tol: float = 1e-10) -> np.ndarray:
+    """Base ortonormal de las columnas de ``block`` (descarta las dependientes)."""
+    u, s, _ = np.linalg.svd(block, full_matrices=False)
+    return u[:, s > tol * max(1.0, s[0] if len(s) else 0.0)]
+
+
+def krylov_spectrum(hamiltonian, psi0s, steps: int = 30) -> Spectrum:
+    """Pares de Ritz de H en la base de Krylov por bloques de ``psi0s``.
+
+    Lanczos por bloques con reortogonalización completa: la base tiene como
+    mucho ``steps`` x B vectores y contiene exactamente los estados iniciales.
+    """
+    H = hamiltonian.to_matrix(sparse=True) if hasattr(hamiltonian, "to_matrix") \
+        else hamiltonian
+    block = _orthonormal(_batch(psi0s)[0].T)
+    basis, images = [], []
+    for _ in range(steps):
+        basis.append(block)
+        images.append(H @ block)
+        Q = np.hstack(basis)
+        w = images[-1]
+        for _ in range(2):
+            w = w - Q @ (Q.conj().T @ w)
+        block = _orthonormal(w)
+        if block.shape[1] == 0:
+            break
+    Q, HQ = np.hstack(basis), np.hstack(images)
+    projected = Q.conj().T @ HQ
+    energies, ritz = np.linalg.eigh((projected + projected.conj().T) / 2)
+    vectors = Q @ ritz
+    residuals = np.linalg.norm(HQ @ ritz - vectors * energies, axis=0)
+    return Spectrum(energies, vectors, residuals)
+
+
+def preparation_states(n: int) -> dict[str, np.ndarray]:
+    """Preparaciones H/CNOT de los scripts para ``n`` protofilamentos.
+
+    ``initial_state(n, s, c)`` (psi0_5 de Caja_negra.m generalizado) para
+    cada número de Hadamard y de CNOT en cadena, y el estado del
+    microtúbulo tras las FASES 1-4 del constructor.
+    """
+    states = {f"H{s}_CX{c}": initial_state(n, s, c).data
+              for s in range(1, n + 1) for c in range(n)}
+    if n >= 3:
+        lattice = MicrotubuleLattice(protofilaments=n)
+        states["microtubule"] = Statevector(
+            build_microtubule_circuit(lattice, measure=False)).data
+    return states
+
+
+class SpectralCache(DiskLRU):
+    """Caché LRU en disco de descomposiciones espectrales de H_total."""
+
+    suffix = ".npz"
+
+    def __init__(self, directory=None, max_bytes: int = 2 * 2**30, memory_entries: int = 4):
+        super().__init__(directory if directory is not None else DEFAULT_DIRECTORY,
+                         max_bytes, memory_entries)
+
+    def _load(self, path: Path) -> Spectrum:
+        return Spectrum.load(path)
+
+    def _dump(self, spectrum: Spectrum, fh):
+        spectrum.save(fh)
+
+    def key(self, epsilon, J, gamma, ring: bool, **extra) -> str:
+        description = {
+            "epsilon": np.asarray(epsilon, dtype=float).tolist(),
+            "J": np.asarray(J, dtype=float).tolist(),
+            "gamma": np.asarray(gamma, dtype=float).tolist(),
+            "ring": ring,
+            **extra,
+        }
+        blob = json.dumps(description, sort_keys=True)
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    def get_or_compute(self, epsilon, J, gamma, *, ring: bool = False,
+                       psi0s=None, krylov_steps: int = 30) -> Spectrum:
+        """Espectro de H_total(ε, J, γ), calculándolo sólo si falta.
+
+        Hasta DENSE_MAX_QUBITS es el espectro completo, con clave sólo de
+        (ε, J, γ), y sirve para cualquier estado inicial.  Por encima hace
+        falta ``psi0s``: la base de Krylov sólo vale para esos estados, así
+        que la entrada se guarda por lote (la clave incluye su hash) y otro
+        lote distinto la vuelve a calcular.
+        """
+        n = len(epsilon)
+        if n <= DENSE_MAX_QUBITS:
+            extra = {"method": "eigh"}
+        elif psi0s is None:
+            raise ValueError(f"Con más de {DENSE_MAX_QUBITS} qubits se necesitan los "
+                             "estados iniciales para la base de Krylov")
+        else:
+            batch = _batch(psi0s)[0]
+            extra = {"method": "krylov", "steps": krylov_steps,
+                     "psi0s": hashlib.sha256(batch.tobytes()).hexdigest()}
+
+        def compute() -> Spectrum:
+            H = microtubule_hamiltonian(epsilon, J, gamma, ring=ring)
+            if extra["method"] == "eigh":
+                return Spectrum(*np.linalg.eigh(H.to_matrix()))
+            return krylov_spectrum(H, batch, krylov_steps)
+
+        return self._get(self.key(epsilon, J, gamma, ring, **extra), compute)
+
+
+def spectral_evolve(epsilon, J, gamma, psi0s, times, *, ring: bool = False,
+                    states=None, cache: SpectralCache | None = None,
+                    krylov_steps: int = 30) -> np.ndarray:
+    """Evoluciona un lote de estados iniciales con el espectro en caché.
+
+    Equivale a ``hamiltonian.evolve`` para cada estado de ``psi0s``; la
+    forma es la de ``Spectrum.evolve``.
+    """
+    cache = cache if cache is not None else SpectralCache()
+    spectrum = cache.get_or_compute(epsilon, J, gamma, ring=ring, psi0s=psi0s,
+                                    krylov_steps=krylov_steps)
+    return spectrum.evolve(psi0s, times, states)
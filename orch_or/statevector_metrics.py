@@ -0,0 +1,133 @@
+# =============================================================================
+# MÉTRICAS VECTORIZADAS DE UN VECTOR DE ESTADO
+# =============================================================================
+#
+# Todas las matrices densidad reducidas de uno y dos qubits se obtienen de
+# los valores esperados de Pauli de uno y dos qubits, calculados todos a la
+# vez como una matriz de Gram, sin construir operadores de 2^n x 2^n ni
+# llamar a partial_trace por cada qubit o par.
+
+from __future__ import annotations
+
+import itertools
+
+import numpy as np
+
+from .profiling import profiled
+
+# Tamaño máximo del bloque de Φ que se construye de una vez (bytes)
+CHUNK_BYTES = 2**24
+
+_PAULIS = np.array([[[0, 1], [1, 0]], [[0, -1j], [1j, 0]], [[1, 0], [0, -1]]])
+
+
+def _amplitudes(state) -> tuple[np.ndarray, int]:
+    data = np.asarray(getattr(state, "data", state), dtype=complex)
+    return data, data.size.bit_length() - 1
+
+
+def _von_neumann(eigenvalues: np.ndarray) -> np.ndarray:
+    p = np.clip(eigenvalues.real, 0.0, 1.0)
+    logs = np.log2(np.where(p > 1e-12, p, 1.0))
+    return -np.sum(p * logs, axis=-1)
+
+
+def _pauli_expectations(state) -> tuple[np.ndarray, np.ndarray]:
+    """⟨σ_a^k⟩ (n, 3) y ⟨σ_a^i σ_b^j⟩ (n, n, 3, 3) en una sola pasada.
+
+    Φ tiene por filas psi y X_k psi, Y_k psi, Z_k psi de cada qubit; como
+    los Pauli son hermíticos y conmutan entre qubits distintos, la matriz de
+    Gram Φ* Φ^T contiene todos los valores esperados de uno y dos qubits.
+    Se acumula por bloques de amplitudes con un producto de BLAS.
+    """
+    psi, n = _amplitudes(state)
+    gram = np.zeros((1 + 3 * n, 1 + 3 * n), dtype=complex)
+    masks = 1 << np.arange(n)
+    step = max(1, CHUNK_BYTES // (16 * (1 + 3 * n)))
+    for start in range(0, psi.size, step):
+        index = np.arange(start, min(start + step, psi.size))
+        flipped = psi[index[None, :] ^ masks[:, None]]                # X_k psi
+        signs = 1 - 2 * ((index[None, :] >> np.arange(n)[:, None]) & 1)
+        rows = np.empty((1 + 3 * n, len(index)), dtype=complex)
+        rows[0] = psi[index]
+        rows[1::3] = flipped
+        rows[2::3] = -1j * signs * flipped                             # Y_k psi
+        rows[3::3] = signs * psi[index]                                # Z_k psi
+        gram += rows.conj() @ rows.T
+    singles = gram[0, 1:].real.reshape(n, 3)
+    pairs = gram[1:, 1:].real.reshape(n, 3, n, 3).transpose(0, 2, 1, 3)
+    return singles, pairs
+
+
+def _single_states(singles: np.ndarray) -> np.ndarray:
+    return (np.eye(2) + np.einsum("ka,axy->kxy", singles, _PAULIS)) / 2
+
+
+def _pair_states(singles, correlators, pairs) -> np.ndarray:
+    """ρ_ij = (I⊗I + Σ⟨σ_a^i⟩ I⊗σ_a + Σ⟨σ_b^j⟩ σ_b⊗I + Σ⟨σ_a^i σ_b^j⟩ σ_b⊗σ_a) / 4."""
+    i, j = np.array(pairs, dtype=int).reshape(-1, 2).T
+    identity = np.eye(2)[None]
+    # Orden de Qiskit: el qubit j (mayor) es el factor de la izquierda
+    low = np.kron(identity, _PAULIS)
+    high = np.kron(_PAULIS, identity)
+    both = np.einsum("bxy,azw->abxzyw", _PAULIS, _PAULIS).reshape(3, 3, 4, 4)
+    rhos = (np.eye(4)
+            + np.einsum("pa,axy->pxy", singles[i], low)
+            + np.einsum("pb,bxy->pxy", singles[j], high)
+            + np.einsum("pab,abxy->pxy", correlators[i, j], both))
+    return rhos / 4
+
+
+def single_qubit_states(state) -> np.ndarray:
+    """Matrices densidad reducidas de cada qubit, forma (n, 2, 2)."""
+    return _single_states(_pauli_expectations(state)[0])
+
+
+def pair_states(state) -> tuple[list[tuple[int, int]], np.ndarray]:
+    """Matrices densidad reducidas de todos los pares, forma (P, 4, 4)."""
+    singles, correlators = _pauli_expectations(state)
+    pairs = list(itertools.combinations(range(len(singles)), 2))
+    return pairs, _pair_states(singles, correlators, pairs)
+
+
+def bloch_vectors(rhos: np.ndarray) -> np.ndarray:
+    """Vectores de Bloch (n, 3) a partir de matrices densidad de un qubit."""
+    return np.stack([2 * rhos[:, 1, 0].real,
+                     2 * rhos[:, 1, 0].imag,
+                     (rhos[:, 0, 0] - rhos[:, 1, 1]).real], axis=-1)
+
+
+@profiled("analyze")
+def state_metrics(state) -> dict:
+    """Bloch, pureza y entropías de uno y dos qubits en una sola pasada.
+
+    ``pair_entropy[i, j]`` es la entropía de von Neumann del par (i, j) y la
+    diagonal la de cada qubit; ``mutual_information`` = S_i + S_j - S_ij.
+    """
+    expectations, correlators = _pauli_expectations(state)
+    n = len(expectations)
+    pairs = list(itertools.combinations(range(n), 2))
+    singles = _single_states(expectations)
+    doubles = _pair_states(expectations, correlators, pairs)
+
+    bloch = bloch_vectors(singles)
+    s_single = _von_neumann(np.linalg.eigvalsh(singles))
+    s_pairs = _von_neumann(np.linalg.eigvalsh(doubles))
+
+    pair_entropy = np.diag(s_single)
+    mutual = np.zeros((n, n))
+    for (i, j), s in zip(pairs, s_pairs):
+        pair_entropy[i, j] = pair_entropy[j, i] = s
+        mutual[i, j] = mutual[j, i] = s_single[i] + s_single[j] - s
+
+    probs = np.abs(np.asarray(getattr(state, "data", state))) ** 2
+    support = probs[probs > 1e-12]
+    return {
+        "probabilities": probs,
+        "shannon_entropy": float(-np.sum(support * np.log2(support))),
+        "bloch": bloch,
+        "purity": (1 + np.sum(bloch**2, axis=-1)) / 2,
+        "entropy": s_single,
+        "pair_entropy": pair_entropy,
+        "mutual_information": mutual,
+    }
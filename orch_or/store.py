@@ -0,0 +1,147 @@
+# =============================================================================
+# ALMACÉN DE RESULTADOS: COLUMNAS BINARIAS + METADATOS JSON LINES
+# =============================================================================
+#
+# Cada columna (probabilidades, vector de estado, cuentas...) es un archivo
+# binario crudo ``<nombre>.<dtype>.bin`` al que sólo se le añaden bytes; el
+# índice ``runs.jsonl`` guarda por ejecución los metadatos (parámetros,
+# semilla, backend, tiempos, métricas) y el desplazamiento y forma de cada
+# arreglo.  La lectura usa np.memmap, así que analizar miles de
+# distribuciones de 2^13 entradas no las carga todas en memoria.
+#
+# La línea de metadatos se escribe después de los datos: una ejecución
+# interrumpida deja bytes huérfanos pero nunca un registro incompleto.
+# Un único proceso escritor por almacén.
+
+from __future__ import annotations
+
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+from .counts import CountsAccumulator
+
+INDEX = "runs.jsonl"
+
+# Los scripts guardan aquí sus resultados además de imprimirlos
+RESULTS_DIR_ENV = "ORCH_OR_RESULTS"
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+def default_store() -> ResultsStore | None:
+    """Almacén en ORCH_OR_RESULTS, o None si no se pidió guardar resultados."""
+    directory = os.environ.get(RESULTS_DIR_ENV)
+    return ResultsStore(directory) if directory else None
+
+
+class ResultsStore:
+    """Almacén de ejecuciones con arreglos en columnas mapeadas en memoria."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _column(self, name: str, dtype: np.dtype) -> Path:
+        return self.directory / f"{name}.{np.dtype(dtype).name}.bin"
+
+    def _append_array(self, name: str, array) -> dict:
+        array = np.ascontiguousarray(array)
+        path = self._column(name, array.dtype)
+        with open(path, "ab") as fh:
+            offset = fh.tell() // array.dtype.itemsize
+            fh.write(array.tobytes())
+        return {"dtype": array.dtype.name, "shape": list(array.shape), "offset": offset}
+
+    def write_run(self, *, counts: dict | None = None, num_bits: int | None = None,
+                  arrays: dict | None = None, metrics: dict | None = None,
+                  parameters: dict | None = None, seed: int | None = None,
+                  backend: str | None = None, timings: dict | None = None,
+                  **metadata) -> str:
+        """Añade una ejecución y devuelve su identificador.
+
+        ``counts`` se guarda como dos columnas (patrones enteros y cuentas);
+        ``arrays`` es ``{nombre: arreglo}`` (p. ej. ``probabilities``,
+        ``statevector``).  ``metrics`` y los demás metadatos deben ser
+        serializables en JSON (se admiten escalares y arreglos NumPy).
+        """
+        arrays = dict(arrays or {})
+        if counts is not None:
+            acc = CountsAccumulator.from_counts(counts, num_bits)
+            arrays["counts_keys"], arrays["counts_values"] = acc.items()
+            metadata["num_bits"] = acc.num_bits
+
+        record = {
+            "run_id": uuid.uuid4().hex,
+            "created": time.time(),
+            "parameters": parameters or {},
+            "seed": seed,
+            "backend": backend,
+            "timings": timings or {},
+            "metrics": metrics or {},
+            **metadata,
+            "arrays": {name: self._append_array(name, value)
+                       for name, value in arrays.items()},
+        }
+        with open(self.directory / INDEX, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(record, default=_json_default, ensure_ascii=False) + "\n")
+        return record["run_id"]
+
+    def runs(self, **filters) -> list[dict]:
+        """Metadatos de todas las ejecuciones, filtrando por igualdad de campos."""
+        path = self.directory / INDEX
+        if not path.exists():
+            return []
+        with open(path, encoding="utf-8") as fh:
+            records = [json.loads(line) for line in fh if line.strip()]
+        return [r for r in records if all(r.get(k) == v for k, v in filters.items())]
+
+    def _memmap(self, name: str, dtype: str) -> np.memmap:
+        return np.memmap(self._column(name, dtype), dtype=dtype, mode="r")
+
+    def array(self, record: dict, name: str) -> np.ndarray:
+        """Arreglo ``name`` de una ejecución como vista de sólo lectura."""
+        info = record["arrays"][name]
+        size = int(np.prod(info["shape"], dtype=np.int64))
+        if size == 0:
+            return np.empty(info["shape"], dtype=info["dtype"])
+        data = self._memmap(name, info["dtype"])
+        return data[info["offset"]:info["offset"] + size].reshape(info["shape"])
+
+    def counts(self, record: dict) -> dict:
+        """Diccionario de cuentas de una ejecución, como ``get_counts``."""
+        acc = CountsAccumulator(record["num_bits"])
+        acc.add_arrays(self.array(record, "counts_keys"), self.array(record, "counts_values"))
+        return acc.to_dict()
+
+    def stack(self, name: str, records: list[dict] | None = None) -> np.ndarray:
+        """Arreglos ``name`` de varias ejecuciones apilados, forma (R, ...).
+
+        Si las ejecuciones ocupan un tramo contiguo de la columna (el caso
+        habitual al añadir en orden) el resultado es un memmap sin copia.
+        """
+        records = [r for r in (records if records is not None else self.runs())
+                   if name in r["arrays"]]
+        if not records:
+            raise KeyError(f"Ninguna ejecución contiene '{name}'")
+        infos = [r["arrays"][name] for r in records]
+        shape, dtype = infos[0]["shape"], infos[0]["dtype"]
+        if any(i["shape"] != shape or i["dtype"] != dtype for i in infos):
+            raise ValueError(f"Las ejecuciones tienen formas distintas para '{name}'")
+        size = int(np.prod(shape, dtype=np.int64))
+        offsets = np.array([i["offset"] for i in infos])
+        data = self._memmap(name, dtype)
+        if np.all(np.diff(offsets) == size):
+            start = offsets[0]
+            return data[start:start + size * len(infos)].reshape(len(infos), *shape)
+        return np.stack([data[o:o + size].reshape(shape) for o in offsets])
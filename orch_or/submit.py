@@ -0,0 +1,203 @@
+# =============================================================================
+# ENVÍO ASÍNCRONO DE TRABAJOS: LOTES, TRABAJOS EN VUELO Y REINTENTOS
+# =============================================================================
+#
+# Los circuitos se agrupan en lotes (un trabajo por lote) y se mantienen como
+# mucho ``max_in_flight`` trabajos enviados a la vez.  ``job.result()``
+# bloquea, así que se espera en un hilo con ``asyncio.to_thread`` y el bucle
+# de eventos sigue enviando lotes y entregando resultados en el orden en que
+# terminan.  Los fallos transitorios (conexión, tiempo de espera, errores
+# declarados en ``retry_on``) se reintentan con espera exponencial.
+#
+# Sirve cualquier objeto con ``run(circuits, **options)`` que devuelva un
+# trabajo con ``result()``: AerSimulator, un backend falso de qiskit o un
+# backend remoto.  ``LocalRuntime`` envuelve Aer añadiendo latencia y fallos
+# aleatorios para probar todo el camino sin conexión.
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from .profiling import phase
+
+logger = logging.getLogger(__name__)
+
+# Sólo fallos de red y de espera: otros OSError (FileNotFoundError,
+# PermissionError, ...) son permanentes y no se reintentan
+TRANSIENT_ERRORS = (ConnectionError, TimeoutError)
+
+
+def batch_seed(seed: int, index: int) -> int:
+    """Semilla independiente del lote ``index`` derivada de ``seed``.
+
+    Es la misma que ``parallel.chunk_seeds(seed, count)[index]``, pero se
+    calcula sin conocer el número de lotes (la entrada puede ser perezosa).
+    """
+    child = np.random.SeedSequence(seed, spawn_key=(index,))
+    return int(child.generate_state(1)[0])
+
+
+class TransientError(ConnectionError):
+    """Fallo simulado de ``LocalRuntime`` (se reintenta como uno de red)."""
+
+
+class _LocalJob:
+    def __init__(self, job, latency: float, fail: bool):
+        self._job = job
+        self._ready = time.monotonic() + latency
+        self._fail = fail
+
+    def job_id(self):
+        return self._job.job_id()
+
+    def cancel(self):
+        return self._job.cancel()
+
+    def result(self):
+        time.sleep(max(0.0, self._ready - time.monotonic()))
+        if self._fail:
+            raise TransientError("fallo transitorio simulado")
+        return self._job.result()
+
+
+class LocalRuntime:
+    """Sustituto local de un backend remoto: Aer con latencia y fallos.
+
+    Cada trabajo tarda al menos ``latency`` segundos y falla con
+    probabilidad ``failure_rate`` al pedir el resultado.
+    """
+
+    def __init__(self, backend=None, *, latency: float = 0.0,
+                 failure_rate: float = 0.0, seed: int | None = None):
+        if backend is None:
+            from qiskit_aer import AerSimulator
+            backend = AerSimulator()
+        self.backend = backend
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._rng = np.random.default_rng(seed)
+        self.submitted = 0
+
+    def run(self, circuits, **options):
+        self.submitted += 1
+        fail = bool(self._rng.random() < self.failure_rate)
+        return _LocalJob(self.backend.run(circuits, **options), self.latency, fail)
+
+
+@dataclass
+class Batch:
+    """Resultado de un lote: posiciones de sus circuitos en la entrada."""
+
+    index: int
+    indices: list[int]
+    result: object
+    attempts: int
+    elapsed: float
+
+    def get_counts(self) -> list[dict]:
+        return [self.result.get_counts(i) for i in range(len(self.indices))]
+
+
+class JobRunner:
+    """Envía lotes de circuitos a ``backend`` con trabajos acotados en vuelo."""
+
+    def __init__(self, backend=None, *, batch_size: int = 16, max_in_flight: int = 4,
+                 retries: int = 3, backoff: float = 0.5,
+                 retry_on: tuple = TRANSIENT_ERRORS, timeout: float | None = None):
+        if batch_size < 1 or max_in_flight < 1:
+            raise ValueError("batch_size y max_in_flight deben ser positivos")
+        self.backend = backend if backend is not None else LocalRuntime()
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        self.retries = retries
+        self.backoff = backoff
+        self.retry_on = tuple(retry_on) + (asyncio.TimeoutError,)
+        self.timeout = timeout
+
+    def _wait(self, job, index: int, attempt: int):
+        with phase("job", batch=index, attempt=attempt):
+            return job.result()
+
+    async def _submit(self, index: int, indices: list[int], circuits: list, options: dict) -> Batch:
+        start = time.perf_counter()
+        if options.get("seed_simulator") is not None:
+            options = {**options, "seed_simulator":
+                       batch_seed(options["seed_simulator"], index)}
+        for attempt in itertools.count(1):
+            job = None
+            try:
+                job = await asyncio.to_thread(self.backend.run, circuits, **options)
+                result = await asyncio.wait_for(
+                    asyncio.to_thread(self._wait, job, index, attempt), self.timeout)
+                return Batch(index, indices, result, attempt, time.perf_counter() - start)
+            except self.retry_on as exc:
+                if job is not None and isinstance(exc, asyncio.TimeoutError):
+                    try:
+                        job.cancel()
+                    except Exception:      # El backend puede no admitir cancelación
+                        pass
+                if attempt > self.retries:
+                    raise
+                delay = self.backoff * 2 ** (attempt - 1)
+                logger.warning("Lote %d: %s (intento %d, reintento en %.2f s)",
+                               index, exc, attempt, delay)
+                await asyncio.sleep(delay)
+
+    def _batches(self, circuits):
+        """Agrupa un iterable (posiblemente perezoso) en lotes numerados."""
+        iterator = iter(enumerate(circuits))
+        for index in itertools.count():
+            chunk = list(itertools.islice(iterator, self.batch_size))
+            if not chunk:
+                return
+            yield index, [i for i, _ in chunk], [qc for _, qc in chunk]
+
+    async def stream(self, circuits, **options):
+        """Entrega cada ``Batch`` en cuanto termina.
+
+        ``circuits`` se consume a medida que hay hueco, así que puede ser un
+        generador de una cola larga; como mucho ``max_in_flight`` lotes
+        están enviados a la vez.  Un lote que agota los reintentos cancela
+        los demás y propaga la excepción.
+
+        Con ``seed_simulator`` cada lote se envía con ``batch_seed(seed,
+        lote)``: los resultados se repiten para la misma semilla,
+        ``batch_size`` y orden de entrada, sin depender de ``max_in_flight``,
+        de los reintentos ni del orden en que terminan los trabajos, pero no
+        coinciden con un único ``backend.run`` con esa semilla.
+        """
+        batches = self._batches(circuits)
+        pending = set()
+        try:
+            while True:
+                for index, indices, chunk in itertools.islice(
+                        batches, self.max_in_flight - len(pending)):
+                    pending.add(asyncio.create_task(self._submit(index, indices, chunk, options)))
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def gather(self, circuits, **options) -> list[Batch]:
+        """Todos los lotes, ordenados por su posición en la entrada."""
+        batches = [batch async for batch in self.stream(circuits, **options)]
+        return sorted(batches, key=lambda batch: batch.index)
+
+    def run(self, circuits, **options) -> list[Batch]:
+        """Versión síncrona de ``gather`` (crea su propio bucle de eventos)."""
+        return asyncio.run(self.gather(circuits, **options))
+
+    def run_counts(self, circuits, **options) -> list[dict]:
+        """Cuentas de cada circuito en el orden de entrada."""
+        return [counts for batch in self.run(circuits, **options)
+                for counts in batch.get_counts()]
@@ -0,0 +1,92 @@
+# =============================================================================
+# BARRIDO DE PARÁMETROS α/β Y POSICIONES DE RUIDO EN UN ÚNICO TRABAJO AER
+# =============================================================================
+#
+# El circuito se construye una sola vez por colocación de ruido con
+# Parameters para los ángulos de tubulina, se transpila una vez y la rejilla
+# completa se envía a Aer mediante ``parameter_binds``.
+
+from __future__ import annotations
+
+import itertools
+from dataclasses import replace
+
+from qiskit import transpile
+from qiskit.circuit import Parameter
+from qiskit_aer import AerSimulator
+
+from .analysis import consciousness_metrics
+from .cache import TranspileCache
+from .kernel import sample_counts
+from .microtubule import MicrotubuleLattice, build_microtubule_circuit
+from .profiling import phase, record_aer
+
+
+def sweep(alphas, betas, noise_placements=None, *,
+          lattice: MicrotubuleLattice | None = None,
+          shots: int = 2048, seed: int | None = None,
+          simulator: AerSimulator | None = None,
+          cache: TranspileCache | None = None,
+          engine: str = "aer") -> list[dict]:
+    """Simula la rejilla ``alphas × betas × noise_placements``.
+
+    ``noise_placements`` es una lista de pares ``(phase_noise, bitflip_noise)``
+    relativos a un anillo; ``None`` usa las posiciones del retículo base.
+    Devuelve una fila por punto con los parámetros, las cuentas y las
+    métricas de consciencia.  Con ``cache`` los circuitos transpilados se
+    reutilizan entre llamadas.  ``engine="numpy"`` evoluciona la rejilla como
+    un lote del simulador de ``kernel`` en vez de enviarla a Aer.
+    """
+    base = lattice if lattice is not None else MicrotubuleLattice()
+    placements = list(noise_placements) if noise_placements else [
+        (base.phase_noise, base.bitflip_noise)]
+    grid = list(itertools.product(alphas, betas))
+
+    alpha, beta = Parameter("α"), Parameter("β")
+    lattices = [replace(base, alpha_angle=alpha, beta_angle=beta,
+                        phase_noise=phase, bitflip_noise=flip)
+                for phase, flip in placements]
+    if engine == "numpy":
+        counts = []
+        for i, lat in enumerate(lattices):
+            qc = build_microtubule_circuit(lat)
+            counts += sample_counts(qc, shots, {alpha: [a for a, _ in grid],
+                                                beta: [b for _, b in grid]},
+                                    seed=None if seed is None else seed + i)
+    elif engine == "aer":
+        counts = _run_aer(lattices, grid, shots, seed, simulator, cache)
+    else:
+        raise ValueError(f"Motor desconocido: {engine}")
+
+    rows = []
+    for i, (placement, (a, b)) in enumerate(itertools.product(placements, grid)):
+        lat = replace(base, phase_noise=placement[0], bitflip_noise=placement[1])
+        rows.append({
+            "alpha": a,
+            "beta": b,
+            "phase_noise": lat.phase_noise_positions(),
+            "bitflip_noise": lat.bitflip_noise_positions(),
+            "counts": counts[i],
+            **consciousness_metrics(counts[i], base.num_qubits),
+        })
+    return rows
+
+
+def _run_aer(lattices, grid, shots, seed, simulator, cache) -> list[dict]:
+    simulator = simulator if simulator is not None else AerSimulator()
+    if cache is not None:
+        tqc = [cache.get_or_build(lat, simulator) for lat in lattices]
+    else:
+        tqc = transpile([build_microtubule_circuit(lat) for lat in lattices], simulator)
+    binds = []
+    for circuit in tqc:
+        # Por nombre: los Parameter de la caché no son los objetos α/β de aquí
+        params = {p.name: p for p in circuit.parameters}
+        binds.append({params["α"]: [a for a, _ in grid],
+                      params["β"]: [b for _, b in grid]})
+
+    with phase("simulate", points=len(grid) * len(lattices)):
+        result = simulator.run(tqc, shots=shots, parameter_binds=binds,
+                               seed_simulator=seed).result()
+        record_aer(result)
+    return [result.get_counts(i) for i in range(len(result.results))]
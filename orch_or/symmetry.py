@@ -0,0 +1,231 @@
+# =============================================================================
+# ANILLO UNIFORME: DIAGONALIZACIÓN POR SECTORES (MAGNETIZACIÓN, MOMENTO)
+# =============================================================================
+#
+# Con ε, J y γ uniformes y el anillo cerrado, H_total conmuta con la
+# traslación T (protofilamento i -> i+1) y con la magnetización total, así
+# que es diagonal por bloques en los sectores (m, k): m = número de qubits
+# en |1⟩ y k = momento cristalino 0..N-1.  Cada bloque se construye
+# directamente en la base de estados de momento
+#
+#   |a(k)⟩ = 1/sqrt(N_a) Σ_r e^{-2πi k r / N} T^r |a⟩,   N_a = N² / R_a
+#
+# (a = representante de la órbita de traslación, R_a = su periodo) y se
+# diagonaliza o evoluciona por separado, con dimensión ~ C(N, m) / N en vez
+# de 2^N.  Casos no uniformes o en cadena abierta usan el camino general de
+# ``hamiltonian``.
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+
+import numpy as np
+import scipy.sparse as sp
+
+from .hamiltonian import evolve, microtubule_hamiltonian
+
+# Bloques de hasta esta dimensión se diagonalizan con eigh (y se guardan);
+# los mayores se evolucionan con expm_multiply
+DENSE_BLOCK_MAX = 2048
+
+
+def _popcount(states: np.ndarray, n: int) -> np.ndarray:
+    count = np.zeros(len(states), dtype=np.int64)
+    for i in range(n):
+        count += (states >> i) & 1
+    return count
+
+
+class _Sector:
+    """Estados de magnetización m, representantes y traslaciones."""
+
+    def __init__(self, n: int, m: int, states: np.ndarray):
+        self.n, self.m = n, m
+        self.states = states                    # Ordenados
+        mask = (1 << n) - 1
+        # Representante (mínimo de la órbita) y l tal que T^l s = representante
+        rep = states.copy()
+        self.shift = np.zeros(len(states), dtype=np.int64)
+        current = states
+        for r in range(1, n):
+            current = ((current << 1) | (current >> (n - 1))) & mask
+            better = current < rep
+            rep[better] = current[better]
+            self.shift[better] = r
+        self.reps = states[rep == states]
+        self.rep_index = np.searchsorted(self.reps, rep)
+        # Rotaciones de cada representante: fila r = T^r a
+        self.rotations = np.empty((n, len(self.reps)), dtype=np.int64)
+        self.rotations[0] = self.reps
+        for r in range(1, n):
+            prev = self.rotations[r - 1]
+            self.rotations[r] = ((prev << 1) | (prev >> (n - 1))) & mask
+        same = np.vstack([self.rotations[1:] == self.reps, np.ones((1, len(self.reps)), bool)])
+        self.periods = np.argmax(same, axis=0) + 1
+
+    def valid(self, k: int) -> np.ndarray:
+        """Representantes con estado de momento k no nulo (k·R_a ≡ 0 mod N)."""
+        return (k * self.periods) % self.n == 0
+
+
+class RingHamiltonian:
+    """H_total de un anillo uniforme de ``n`` protofilamentos por sectores (m, k).
+
+    ``evolve`` devuelve lo mismo que ``hamiltonian.evolve`` con el operador
+    completo, y ``hamiltonian.evolve(ring, psi0, times)`` delega aquí.
+    """
+
+    def __init__(self, n: int, epsilon: float, J: float, gamma: float = 0.0,
+                 workers: int | None = None):
+        if n < 3:
+            raise ValueError("El anillo necesita al menos 3 protofilamentos")
+        self.n = n
+        self.field = float(epsilon) + float(gamma)
+        self.J = float(J)
+        self.workers = workers
+        self._eigh = {}
+
+    @property
+    def num_qubits(self) -> int:
+        return self.n
+
+    @cached_property
+    def _sectors(self) -> list[_Sector]:
+        states = np.arange(2**self.n, dtype=np.int64)
+        counts = _popcount(states, self.n)
+        return [_Sector(self.n, m, states[counts == m]) for m in range(self.n + 1)]
+
+    def sectors(self) -> list[tuple[int, int, int]]:
+        """Lista de sectores no vacíos ``(m, k, dimensión)``."""
+        return [(s.m, k, int(s.valid(k).sum()))
+                for s in self._sectors for k in range(self.n) if s.valid(k).any()]
+
+    def _terms(self, sector: _Sector):
+        """Diagonal y elementos fuera de la diagonal (fila, columna, l, amplitud)."""
+        n, reps = self.n, sector.reps
+        antialigned = np.zeros(len(reps), dtype=np.int64)
+        rows, cols, shifts, amps = [], [], [], []
+        for i in range(n):
+            j = (i + 1) % n
+            flip = ((reps >> i) & 1) != ((reps >> j) & 1)
+            antialigned += flip
+            a = np.flatnonzero(flip)
+            target = np.searchsorted(sector.states, reps[a] ^ ((1 << i) | (1 << j)))
+            b = sector.rep_index[target]
+            rows.append(b)
+            cols.append(a)
+            shifts.append(sector.shift[target])
+            # XX + YY intercambia el par antialineado con amplitud 2J
+            amps.append(2 * self.J * np.sqrt(sector.periods[a] / sector.periods[b]))
+        diagonal = self.field * (n - 2 * sector.m) + self.J * (n - 2 * antialigned)
+        return diagonal, *(np.concatenate(x) for x in (rows, cols, shifts, amps))
+
+    def block(self, m: int, k: int) -> sp.csr_matrix:
+        """Bloque hermítico del sector (m, k) en la base |a(k)⟩."""
+        sector = self._sectors[m]
+        valid = sector.valid(k)
+        local = np.cumsum(valid) - 1
+        diagonal, rows, cols, shifts, amps = self._terms(sector)
+        keep = valid[rows] & valid[cols]
+        values = amps[keep] * np.exp(-2j * np.pi * k * shifts[keep] / self.n)
+        dim = int(valid.sum())
+        H = sp.coo_matrix((values, (local[rows[keep]], local[cols[keep]])), shape=(dim, dim))
+        return (H + sp.diags(diagonal[valid].astype(complex))).tocsr()
+
+    def eigh(self, m: int, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Autovalores y autovectores del bloque (m, k), guardados para reutilizar."""
+        if (m, k) not in self._eigh:
+            self._eigh[(m, k)] = np.linalg.eigh(self.block(m, k).toarray())
+        return self._eigh[(m, k)]
+
+    def spectrum(self) -> np.ndarray:
+        """Autovalores de todos los bloques, ordenados (los 2^N de H_total)."""
+        blocks = [(m, k) for m, k, _ in self.sectors()]
+        with ThreadPoolExecutor(self.workers) as pool:
+            values = list(pool.map(lambda mk: self.eigh(*mk)[0], blocks))
+        return np.sort(np.concatenate(values))
+
+    def to_sectors(self, psi) -> list[np.ndarray]:
+        """Coeficientes ⟨a(k)|psi⟩ por magnetización, forma (..., N, representantes)."""
+        psi = np.asarray(getattr(psi, "data", psi), dtype=complex)
+        return [np.sqrt(s.periods) * np.fft.ifft(psi[..., s.rotations], axis=-2)
+                for s in self._sectors]
+
+    def from_sectors(self, coefficients, states=None) -> np.ndarray:
+        """Amplitudes de la base computacional a partir de los coeficientes por sector.
+
+        Con ``states`` (índices de la base computacional) sólo se reconstruyen
+        esas amplitudes, sin materializar el vector de 2^N.
+        """
+        if states is None:
+            lead = coefficients[0].shape[:-2]
+            psi = np.zeros(lead + (2**self.n,), dtype=complex)
+            for s, c in zip(self._sectors, coefficients):
+                psi[..., s.rotations] = np.fft.fft(c, axis=-2) / np.sqrt(s.periods)
+            return psi
+        states = np.asarray(states, dtype=np.int64)
+        counts = _popcount(states, self.n)
+        lead = coefficients[0].shape[:-2]
+        out = np.zeros(lead + (len(states),), dtype=complex)
+        phases = np.exp(-2j * np.pi * np.arange(self.n) / self.n)
+        for index, (state, m) in enumerate(zip(states, counts)):
+            s = self._sectors[m]
+            position = np.searchsorted(s.states, state)
+            a = s.rep_index[position]
+            r = (-s.shift[position]) % self.n     # state = T^r a
+            out[..., index] = (coefficients[m][..., :, a] @ phases ** r
+                               / np.sqrt(s.periods[a]))
+        return out
+
+    def _evolve_block(self, m: int, k: int, c0: np.ndarray, times: np.ndarray) -> np.ndarray:
+        if len(c0) <= DENSE_BLOCK_MAX:
+            energies, vectors = self.eigh(m, k)
+            phases = np.exp(-1j * np.outer(times, energies))
+            return (phases * (vectors.conj().T @ c0)) @ vectors.T
+        return evolve(self.block(m, k), c0, times)
+
+    def evolve(self, psi0, times, states=None) -> np.ndarray:
+        """psi(t) = exp(-i H t) psi0, forma (T, 2^N) o (T, len(states)).
+
+        Los bloques con componente no nula se evolucionan por separado y en
+        paralelo (hilos: eigh y expm_multiply liberan el GIL).
+        """
+        times = np.asarray(times, dtype=float)
+        start = self.to_sectors(psi0)
+        jobs = []
+        for s, c in zip(self._sectors, start):
+            for k in range(self.n):
+                valid = s.valid(k)
+                if valid.any() and np.any(np.abs(c[k, valid]) > 0):
+                    jobs.append((s.m, k, valid))
+        with ThreadPoolExecutor(self.workers) as pool:
+            evolved = list(pool.map(
+                lambda job: self._evolve_block(job[0], job[1], start[job[0]][job[1], job[2]],
+                                               times), jobs))
+        coefficients = [np.zeros((len(times),) + c.shape, dtype=complex) for c in start]
+        for (m, k, valid), c_t in zip(jobs, evolved):
+            coefficients[m][:, k, valid] = c_t
+        return self.from_sectors(coefficients, states)
+
+
+def _uniform(values) -> bool:
+    values = np.asarray(values, dtype=float)
+    return bool(np.allclose(values, values[0]))
+
+
+def symmetric_hamiltonian(epsilon, J, gamma, *, ring: bool = True, workers: int | None = None):
+    """``RingHamiltonian`` si el anillo es uniforme; si no, el operador general.
+
+    Sólo importa ε_i + γ_i (ambos acompañan a Z_i), así que basta con que esa
+    suma y los J del anillo sean uniformes.  El resultado se puede pasar
+    siempre a ``hamiltonian.evolve``.
+    """
+    epsilon = np.asarray(epsilon, dtype=float)
+    gamma = np.asarray(gamma, dtype=float)
+    n = len(epsilon)
+    J = np.asarray(J, dtype=float)
+    if ring and n >= 3 and len(gamma) == n and len(J) >= n \
+            and _uniform(epsilon + gamma) and _uniform(J[:n]):
+        return RingHamiltonian(n, epsilon[0], J[0], gamma[0], workers=workers)
+    return microtubule_hamiltonian(epsilon, J, gamma, ring=ring)
@@ -0,0 +1,172 @@
+# =============================================================================
+# EVOLUCIÓN TEMPORAL CON PUNTOS DE CONTROL Y TRAYECTORIA EN DISCO
+# =============================================================================
+#
+# En lugar de guardar toda la matriz psi_t (dimensión x pasos) en memoria
+# como Caja_negra.m, la rejilla de tiempos se recorre por bloques de
+# ``checkpoint_every`` pasos: cada bloque se evoluciona con
+# ``hamiltonian.evolve``, se escribe en un .npy mapeado en memoria (estados
+# y/o observables) y después se guarda un punto de control atómico con el
+# último estado.  Si el proceso muere, la siguiente llamada con el mismo
+# directorio continúa desde el último bloque completo.
+#
+#   run/meta.json         parámetros y huellas para validar la reanudación
+#   run/times.npy         rejilla de tiempos
+#   run/states.npy        (T, 2^N) complejo, sólo con store_states=True
+#   run/<observable>.npy  (T, ...) por observable
+#   run/checkpoint.npz    último paso completo y su estado
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import scipy.sparse as sp
+from qiskit.quantum_info import SparsePauliOp
+
+from .hamiltonian import evolve
+from .profiling import phase
+
+META = "meta.json"
+CHECKPOINT = "checkpoint.npz"
+
+# Tamaño máximo del bloque de estados que se evoluciona de una vez (bytes)
+CHUNK_BYTES = 2**28
+
+
+def _fingerprint(hamiltonian) -> str | None:
+    """Huella del Hamiltoniano para no reanudar con otro distinto."""
+    digest = hashlib.sha256()
+    if isinstance(hamiltonian, SparsePauliOp):
+        digest.update(json.dumps([(label, complex(c).real, complex(c).imag)
+                                  for label, c in hamiltonian.to_list()]).encode())
+    elif sp.issparse(hamiltonian):
+        csr = sp.csr_matrix(hamiltonian)
+        for part in (csr.data, csr.indices, csr.indptr):
+            digest.update(np.ascontiguousarray(part).tobytes())
+    elif isinstance(hamiltonian, np.ndarray):
+        digest.update(np.ascontiguousarray(hamiltonian).tobytes())
+    elif hasattr(hamiltonian, "to_sectors"):
+        digest.update(repr((hamiltonian.n, hamiltonian.field, hamiltonian.J)).encode())
+    else:
+        return None
+    return digest.hexdigest()
+
+
+def _save_checkpoint(directory: Path, step: int, psi: np.ndarray):
+    tmp = directory / f"checkpoint.{os.getpid()}.tmp"
+    with open(tmp, "wb") as fh:
+        np.savez(fh, step=step, psi=psi)
+    os.replace(tmp, directory / CHECKPOINT)
+
+
+def load_trajectory(directory) -> dict:
+    """Tiempos, estados y observables guardados (mapeados en modo lectura).
+
+    ``completed`` es el número de pasos ya calculados; las filas
+    posteriores de los arreglos no son válidas.
+    """
+    directory = Path(directory)
+    meta = json.loads((directory / META).read_text(encoding="utf-8"))
+    checkpoint = directory / CHECKPOINT
+    completed = 0
+    if checkpoint.exists():
+        with np.load(checkpoint) as saved:
+            completed = int(saved["step"]) + 1
+    data = {"times": np.load(directory / "times.npy"), "completed": completed,
+            "states": None, "observables": {}}
+    if meta["store_states"]:
+        data["states"] = np.load(directory / "states.npy", mmap_mode="r")
+    for name in meta["observables"]:
+        path = directory / f"{name}.npy"
+        if path.exists():
+            data["observables"][name] = np.load(path, mmap_mode="r")
+    return data
+
+
+def evolve_checkpointed(hamiltonian, psi0, times, directory, *,
+                        observables: dict | None = None, store_states: bool = True,
+                        checkpoint_every: int = 100, resume: bool = True) -> dict:
+    """psi(t) = exp(-i H t) psi0 sobre ``times`` con trayectoria en disco.
+
+    ``observables`` es ``{nombre: f}`` con ``f`` aplicada a un bloque de
+    estados (B, 2^N) y que devuelve un arreglo (B, ...), p. ej.
+    ``{"coherence": hamiltonian.coherence}``; con ``store_states=False``
+    sólo se guardan los observables.  ``hamiltonian`` es cualquier operador
+    que acepte ``hamiltonian.evolve`` (SparsePauliOp, matriz dispersa o
+    ``RingHamiltonian``).  Con ``resume=False`` se descarta lo que haya en
+    ``directory``.  Devuelve lo mismo que ``load_trajectory``.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    observables = dict(observables or {})
+    if not store_states and not observables:
+        raise ValueError("Sin estados ni observables no hay nada que guardar")
+    H = hamiltonian.to_matrix(sparse=True) if isinstance(hamiltonian, SparsePauliOp) \
+        else hamiltonian
+    psi0 = np.asarray(getattr(psi0, "data", psi0), dtype=complex)
+    times = np.asarray(times, dtype=float)
+    meta = {
+        "dimension": len(psi0),
+        "steps": len(times),
+        "store_states": store_states,
+        "observables": sorted(observables),
+        "hamiltonian": _fingerprint(hamiltonian),
+        "psi0": hashlib.sha256(psi0.tobytes()).hexdigest(),
+        "times": hashlib.sha256(times.tobytes()).hexdigest(),
+    }
+
+    checkpoint = directory / CHECKPOINT
+    start, psi = 0, psi0
+    if resume and checkpoint.exists():
+        previous = json.loads((directory / META).read_text(encoding="utf-8"))
+        if previous != meta:
+            changed = sorted(k for k in meta if previous.get(k) != meta[k])
+            raise ValueError(f"El directorio contiene otra evolución (difiere: {changed})")
+        with np.load(checkpoint) as saved:
+            start, psi = int(saved["step"]) + 1, saved["psi"]
+    else:
+        checkpoint.unlink(missing_ok=True)
+        (directory / META).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        np.save(directory / "times.npy", times)
+
+    states = None
+    if store_states:
+        path = directory / "states.npy"
+        states = (np.load(path, mmap_mode="r+") if start else
+                  np.lib.format.open_memmap(path, mode="w+", dtype=complex,
+                                            shape=(len(times), len(psi0))))
+    outputs = {name: np.load(directory / f"{name}.npy", mmap_mode="r+")
+               for name in observables if start and (directory / f"{name}.npy").exists()}
+
+    def write(offset: int, chunk: np.ndarray):
+        if states is not None:
+            states[offset:offset + len(chunk)] = chunk
+            states.flush()
+        for name, fn in observables.items():
+            values = np.asarray(fn(chunk))
+            if name not in outputs:
+                outputs[name] = np.lib.format.open_memmap(
+                    directory / f"{name}.npy", mode="w+", dtype=values.dtype,
+                    shape=(len(times),) + values.shape[1:])
+            outputs[name][offset:offset + len(chunk)] = values
+            outputs[name].flush()
+        # Los datos van a disco antes que el punto de control
+        _save_checkpoint(directory, offset + len(chunk) - 1, chunk[-1])
+
+    if start == 0:
+        first = psi0[None] if times[0] == 0 else evolve(H, psi0, [0.0, times[0]])[1:]
+        write(0, first)
+        start, psi = 1, first[-1]
+    block = max(1, min(checkpoint_every, CHUNK_BYTES // (16 * len(psi0))))
+    while start < len(times):
+        stop = min(start + block, len(times))
+        with phase("evolve", start=start, steps=stop - start):
+            # Tiempos relativos al último estado calculado
+            chunk = evolve(H, psi, times[start - 1:stop] - times[start - 1])[1:]
+        write(start, chunk)
+        start, psi = stop, chunk[-1]
+    return load_trajectory(directory)
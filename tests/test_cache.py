@@ -0,0 +1,21 @@
+import pytest
+
+from orch_or.cache import DiskLRU, TranspileCache
+from orch_or.microtubule import MicrotubuleLattice
+
+
+def test_subclass_without_hooks_fails_at_instantiation(tmp_path):
+    class Incomplete(DiskLRU):
+        def _load(self, path):
+            return path.read_bytes()
+
+    with pytest.raises(TypeError):
+        Incomplete(tmp_path, max_bytes=1024, memory_entries=1)
+
+
+def test_entry_larger_than_limit_survives_eviction(tmp_path):
+    lattice = MicrotubuleLattice(protofilaments=5)
+    TranspileCache(tmp_path, max_bytes=1).get_or_build(lattice)
+    cache = TranspileCache(tmp_path, max_bytes=1)
+    cache.get_or_build(lattice)
+    assert cache.stats()["disk_hits"] == 1
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+from qiskit import QuantumCircuit
+from qiskit.circuit import Parameter
+from qiskit.quantum_info import Statevector
+
+from orch_or.kernel import statevectors
+
+
+@pytest.mark.parametrize("gate", ["crz", "rzz", "cp"])
+def test_batched_parametric_two_qubit_gates(gate):
+    theta = Parameter("θ")
+    qc = QuantumCircuit(3)
+    qc.h(range(3))
+    qc.ry(0.3, 1)
+    getattr(qc, gate)(theta, 0, 2)
+    getattr(qc, gate)(2 * theta, 2, 1)
+    values = np.linspace(-1.0, 2.5, 5)
+
+    states = statevectors(qc, {theta: values})
+    assert states.shape == (len(values), 8)
+    for value, state in zip(values, states):
+        expected = Statevector(qc.assign_parameters({theta: value})).data
+        np.testing.assert_allclose(state, expected, atol=1e-12)
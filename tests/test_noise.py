@@ -0,0 +1,72 @@
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Statevector
+from qiskit_aer import AerSimulator
+from qiskit_aer.noise import thermal_relaxation_error
+
+from orch_or.microtubule import MicrotubuleLattice, build_microtubule_circuit
+from orch_or.noise import (NoiseConfig, TubulinNoise, build_noise_model, clifford_circuit,
+                           run_noisy, select_method)
+
+IDEAL = NoiseConfig(alpha=TubulinNoise(np.inf, np.inf), beta=TubulinNoise(np.inf, np.inf),
+                    temperature=0.0)
+
+
+def test_clifford_rotations_run_on_stabilizer():
+    qc = QuantumCircuit(3)
+    qc.h(0)
+    qc.ry(np.pi / 2, 1)
+    qc.rx(-np.pi / 2, 2)
+    qc.cx(0, 1)
+    qc.rz(np.pi, 1)
+    qc.ry(3 * np.pi / 2, 2)
+    expected = Statevector(qc).probabilities_dict()
+    qc.measure_all()
+
+    assert select_method(qc)["method"] == "stabilizer"
+    shots = 4000
+    counts = AerSimulator(method="stabilizer").run(
+        clifford_circuit(qc), shots=shots, seed_simulator=3).result().get_counts()
+    for key in set(expected) | set(counts):
+        assert abs(counts.get(key, 0) / shots - expected.get(key, 0.0)) < 0.04
+
+
+def test_non_clifford_angle_is_not_stabilizer():
+    qc = QuantumCircuit(1, 1)
+    qc.ry(0.2, 0)
+    qc.measure(0, 0)
+    assert clifford_circuit(qc) is None
+    assert select_method(qc)["method"] != "stabilizer"
+
+
+def test_run_noisy_clifford_lattice_with_emotional_readout():
+    # Readout emocional ry(π/2) y colapso condicional (if_else)
+    lattice = MicrotubuleLattice(protofilaments=5, alpha_angle=np.pi / 2, beta_angle=np.pi / 2)
+    assert select_method(build_microtubule_circuit(lattice))["method"] == "stabilizer"
+    counts = run_noisy(lattice, IDEAL, shots=200, seed=1)
+    assert sum(counts.values()) == 200
+
+
+def _relaxation_error(model, qubit):
+    for error in model.to_dict()["errors"]:
+        if "h" in error["operations"] and error["gate_qubits"] == [(qubit,)]:
+            return error
+    raise KeyError(qubit)
+
+
+def test_two_ring_lattice_uses_alpha_beta_by_ring_position():
+    config = NoiseConfig()
+    lattice = MicrotubuleLattice(protofilaments=13, rings=2)
+    model = build_noise_model(config, lattice.num_qubits,
+                              protofilaments=lattice.protofilaments, pairs=[])
+    population = config.excited_population()
+
+    def expected(tubulin):
+        error = thermal_relaxation_error(tubulin.t1, tubulin.t2, config.gate_time, population)
+        return error.to_dict()
+
+    # Qubit 13 = posición 0 del anillo 1 (α); qubit 14 = posición 1 (β)
+    for qubit, tubulin in ((13, config.alpha), (14, config.beta)):
+        error = _relaxation_error(model, qubit)
+        assert error["probabilities"] == expected(tubulin)["probabilities"]
+        assert error["instructions"] == expected(tubulin)["instructions"]
@@ -0,0 +1,20 @@
+import importlib
+import pkgutil
+from unittest import mock
+
+import orch_or
+
+
+def test_exports_do_not_shadow_submodules():
+    modules = {info.name for info in pkgutil.iter_modules(orch_or.__path__)}
+    assert not modules & set(orch_or.__all__)
+
+
+def test_submodule_import_patch_and_reload():
+    import orch_or.sweeps as sweeps
+
+    assert callable(orch_or.sweep)
+    assert orch_or.sweeps is sweeps
+    with mock.patch("orch_or.sweeps._run_aer") as run:
+        assert orch_or.sweeps._run_aer is run
+    assert importlib.reload(sweeps) is sweeps
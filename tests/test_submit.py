@@ -0,0 +1,66 @@
+import pytest
+from qiskit import QuantumCircuit
+from qiskit_aer import AerSimulator
+
+from orch_or.parallel import chunk_seeds
+from orch_or.submit import JobRunner, batch_seed
+
+
+def _circuits(count):
+    qc = QuantumCircuit(4, 4)
+    qc.h(range(4))
+    qc.measure(range(4), range(4))
+    return [qc.copy() for _ in range(count)]
+
+
+def test_batch_seed_matches_chunk_seeds():
+    assert [batch_seed(11, i) for i in range(5)] == chunk_seeds(11, 5)
+
+
+def test_batches_match_direct_runs_with_spawned_seeds():
+    circuits = _circuits(6)
+    simulator = AerSimulator()
+    runner = JobRunner(simulator, batch_size=2, max_in_flight=2)
+    counts = runner.run_counts(circuits, shots=256, seed_simulator=11)
+
+    expected = []
+    for index, seed in enumerate(chunk_seeds(11, 3)):
+        result = simulator.run(circuits[2 * index:2 * index + 2], shots=256,
+                               seed_simulator=seed).result()
+        expected += [result.get_counts(i) for i in range(2)]
+    assert counts == expected
+    # Los lotes no repiten las muestras del primero
+    assert counts[0] != counts[2] and counts[0] != counts[4]
+
+
+def test_counts_do_not_depend_on_jobs_in_flight():
+    circuits = _circuits(5)
+    runs = [JobRunner(AerSimulator(), batch_size=2, max_in_flight=k)
+            .run_counts(circuits, shots=128, seed_simulator=5) for k in (1, 3)]
+    assert runs[0] == runs[1]
+
+
+class _FailingBackend:
+    def __init__(self, exc):
+        self.exc = exc
+        self.calls = 0
+
+    def run(self, circuits, **options):
+        self.calls += 1
+        raise self.exc
+
+
+def test_permanent_os_errors_are_not_retried():
+    backend = _FailingBackend(PermissionError("sin permiso"))
+    runner = JobRunner(backend, retries=3, backoff=0.0)
+    with pytest.raises(PermissionError):
+        runner.run(_circuits(1), shots=8)
+    assert backend.calls == 1
+
+
+def test_connection_errors_are_retried():
+    backend = _FailingBackend(ConnectionError("caída"))
+    runner = JobRunner(backend, retries=2, backoff=0.0)
+    with pytest.raises(ConnectionError):
+        runner.run(_circuits(1), shots=8)
+    assert backend.calls == 3
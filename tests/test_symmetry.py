@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from orch_or.hamiltonian import evolve, microtubule_hamiltonian
+from orch_or.symmetry import RingHamiltonian
+
+
+def _random_state(n, seed):
+    rng = np.random.default_rng(seed)
+    psi = rng.normal(size=2**n) + 1j * rng.normal(size=2**n)
+    return psi / np.linalg.norm(psi)
+
+
+@pytest.mark.parametrize("n", [3, 4, 7])
+def test_evolve_matches_general_operator(n):
+    ring = RingHamiltonian(n, 0.2, 0.05, 0.03)
+    H = microtubule_hamiltonian([0.2] * n, [0.05] * n, [0.03] * n, ring=True)
+    psi0 = _random_state(n, n)
+    times = np.linspace(0.0, 3.0, 5)
+    np.testing.assert_allclose(ring.evolve(psi0, times), evolve(H, psi0, times), atol=1e-10)
+
+
+@pytest.mark.parametrize("n", [3, 4, 7])
+def test_selected_states_match_full_vector(n):
+    ring = RingHamiltonian(n, 0.2, 0.05, 0.03)
+    psi0 = _random_state(n, 10 + n)
+    times = np.linspace(0.0, 3.0, 5)
+    full = ring.evolve(psi0, times)
+    np.testing.assert_allclose(ring.evolve(psi0, times, states=range(2**n)), full, atol=1e-12)
@@ -1,11 +1,14 @@
 # Importar librerías para visualizaciones cuánticas avanzadas
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import AerSimulator, StatevectorSimulator
-from qiskit.visualization import plot_bloch_multivector, plot_state_qsphere, plot_state_city
-from qiskit.quantum_info import Statevector, partial_trace, entropy, concurrence
+from qiskit import QuantumCircuit
+from qiskit.visualization import plot_state_qsphere, plot_state_city
 import matplotlib.pyplot as plt
 import numpy as np
-from qiskit.visualization import plot_histogram
+
+from orch_or.evolution import stage_snapshots
+from orch_or.figures import (FIGURE_FORMATS, bloch_figure, city_figure, evolution_figure,
+                             output_directory, qsphere_figure, save_figure, sphere_mesh)
+from orch_or.statevector_metrics import state_metrics
+from orch_or.store import default_store
 
 # =============================================================================
 # VISUALIZACIONES CUÁNTICAS AVANZADAS PARA ORCH-OR
@@ -16,6 +19,9 @@ print("=" * 60)
 print("Analizando superposición, entrelazamiento y evolución cuántica")
 print("=" * 60)
 
+# Con ORCH_OR_FIGURES=<directorio> las figuras se guardan sin pantalla
+figures_dir = output_directory()
+
 # Crear un circuito simplificado para visualización (3 qubits)
 # (13 qubits son demasiados para visualizar eficientemente)
 print("\n🔬 CIRCUITO SIMPLIFICADO PARA ANÁLISIS CUÁNTICO:")
@@ -26,17 +32,20 @@ qc_vis = QuantumCircuit(3)
 # Fase 1: Crear superposición
 qc_vis.h(0)  # Protofilamento central
 qc_vis.h(1)  # Protofilamento adyacente
+qc_vis.barrier(label="Después de Superposición")
 print("   • Superposición en qubits 0 y 1")
 
 # Fase 2: Crear entrelazamiento
 qc_vis.cx(0, 1)  # Entrelazamiento principal
 qc_vis.cx(1, 2)  # Entrelazamiento en cadena
+qc_vis.barrier(label="Después de Entrelazamiento")
 print("   • Entrelazamiento: 0-1-2")
 
 # Fase 3: Rotaciones específicas (diferenciación α/β tubulina)
 qc_vis.rz(0.3, 0)  # α-tubulina
 qc_vis.ry(0.4, 1)  # β-tubulina
 qc_vis.rx(0.2, 2)  # Interacción mixta
+qc_vis.barrier(label="Estado Final (con diferenciación)")
 print("   • Diferenciación tubulinas con rotaciones específicas")
 
 print(f"\nCircuito cuántico simplificado:")
@@ -49,41 +58,15 @@ print(qc_vis.draw())
 print("\n1️⃣ EVOLUCIÓN DEL ESTADO CUÁNTICO")
 print("=" * 40)
 
-# Simulador de vector de estado
-statevector_sim = StatevectorSimulator()
-
-# Estados en diferentes etapas
-states = []
-state_labels = []
-
-# Estado inicial |000⟩
-qc_init = QuantumCircuit(3)
-state_init = Statevector.from_instruction(qc_init)
-states.append(state_init)
-state_labels.append("Estado Inicial |000⟩")
-
-# Después de superposición
-qc_super = QuantumCircuit(3)
-qc_super.h(0)
-qc_super.h(1)
-state_super = Statevector.from_instruction(qc_super)
-states.append(state_super)
-state_labels.append("Después de Superposición")
-
-# Después de entrelazamiento
-qc_entangled = QuantumCircuit(3)
-qc_entangled.h(0)
-qc_entangled.h(1)
-qc_entangled.cx(0, 1)
-qc_entangled.cx(1, 2)
-state_entangled = Statevector.from_instruction(qc_entangled)
-states.append(state_entangled)
-state_labels.append("Después de Entrelazamiento")
-
-# Estado final completo
-state_final = Statevector.from_instruction(qc_vis)
-states.append(state_final)
-state_labels.append("Estado Final (con diferenciación)")
+# Estados en diferentes etapas: una sola evolución con instantáneas
+# en cada barrera etiquetada del circuito
+snapshots = stage_snapshots(qc_vis, initial="Estado Inicial |000⟩")
+states = list(snapshots.values())
+state_labels = list(snapshots)
+state_init, state_super, state_entangled, state_final = states
+
+# Con ORCH_OR_RESULTS=<directorio> cada etapa se guarda en el almacén
+store = default_store()
 
 # Analizar cada estado
 print("\n📊 ANÁLISIS DE EVOLUCIÓN:")
@@ -94,14 +77,18 @@ for i, (state, label) in enumerate(zip(states, state_labels)):
     probs = state.probabilities()
     print(f"   • Distribución de probabilidades: {[f'{p:.3f}' for p in probs[:4]]}...")
     
-    # Calcular entropía (medida de superposición)
-    try:
-        # Entropía de von Neumann
-        rho = state.to_operator()
-        ent = entropy(rho, base=2)
-        print(f"   • Entropía cuántica: {ent:.3f} bits")
-    except:
-        print(f"   • Entropía cuántica: No calculable")
+    # Entropía de entrelazamiento media por protofilamento
+    metrics = state_metrics(state)
+    print(f"   • Entropía cuántica: {metrics['entropy'].mean():.3f} bits (media por qubit)")
+    
+    if store is not None:
+        store.write_run(
+            arrays={"probabilities": probs, "statevector": state.data},
+            metrics={key: metrics[key] for key in ("entropy", "purity", "bloch")},
+            parameters={"stage": i, "label": label},
+            backend="statevector",
+            script="visualizacion_3qbits.py",
+        )
 
 # =============================================================================
 # 2. ESFERAS DE BLOCH MULTIVECTOR
@@ -114,82 +101,52 @@ print("=" * 40)
 print("Calculando estados reducidos para cada protofilamento...")
 
 try:
-    # Estados reducidos (trazar otros qubits)
-    rho_0 = partial_trace(state_final, [1, 2])  # Solo qubit 0
-    rho_1 = partial_trace(state_final, [0, 2])  # Solo qubit 1  
-    rho_2 = partial_trace(state_final, [0, 1])  # Solo qubit 2
+    # Estados reducidos de todos los qubits en una sola pasada
+    final_metrics = state_metrics(state_final)
+    bloch_vectors = final_metrics["bloch"]
     
     print("Estados reducidos calculados exitosamente")
     
-    # Crear figura para esferas de Bloch
-    fig, axes = plt.subplots(1, 3, figsize=(15, 5), subplot_kw={'projection': '3d'})
-    
-    # Convertir matrices densidad a vectores de Bloch
-    from qiskit.quantum_info import DensityMatrix
-    
-    # Calcular vectores de Bloch manualmente
-    def density_to_bloch_vector(rho):
-        """Convierte matriz densidad a vector de Bloch"""
-        if hasattr(rho, 'data'):
-            rho_matrix = rho.data
-        else:
-            rho_matrix = rho
-            
-        # Matrices de Pauli
-        sigma_x = np.array([[0, 1], [1, 0]])
-        sigma_y = np.array([[0, -1j], [1j, 0]])
-        sigma_z = np.array([[1, 0], [0, -1]])
-        
-        # Componentes del vector de Bloch
-        x = np.real(np.trace(rho_matrix @ sigma_x))
-        y = np.real(np.trace(rho_matrix @ sigma_y))
-        z = np.real(np.trace(rho_matrix @ sigma_z))
-        
-        return [x, y, z]
-    
-    bloch_vectors = [
-        density_to_bloch_vector(rho_0),
-        density_to_bloch_vector(rho_1),
-        density_to_bloch_vector(rho_2)
-    ]
-    
     qubit_names = ["α-tubulina (Q0)", "β-tubulina (Q1)", "Interacción (Q2)"]
     
-    for i, (bloch_vec, name) in enumerate(zip(bloch_vectors, qubit_names)):
-        ax = axes[i]
-        
-        # Dibujar esfera
-        u = np.linspace(0, 2 * np.pi, 50)
-        v = np.linspace(0, np.pi, 50)
-        x_sphere = np.outer(np.cos(u), np.sin(v))
-        y_sphere = np.outer(np.sin(u), np.sin(v))
-        z_sphere = np.outer(np.ones(np.size(u)), np.cos(v))
-        
-        ax.plot_surface(x_sphere, y_sphere, z_sphere, alpha=0.1, color='lightblue')
-        
-        # Dibujar vector de Bloch
-        ax.quiver(0, 0, 0, bloch_vec[0], bloch_vec[1], bloch_vec[2], 
-                 color='red', arrow_length_ratio=0.1, linewidth=3)
+    # Información del estado
+    for i, name in enumerate(qubit_names):
+        purity = final_metrics["purity"][i]
+        print(f"   • {name}: Pureza = {purity:.3f}")
+    
+    if figures_dir is not None:
+        save_figure(bloch_figure(state_final, qubit_names,
+                                 title="🧠 Esferas de Bloch - Estados de Protofilamentos"),
+                    figures_dir / "bloch", FIGURE_FORMATS)
+    else:
+        # Crear figura para esferas de Bloch
+        fig, axes = plt.subplots(1, 3, figsize=(15, 5), subplot_kw={'projection': '3d'})
         
-        # Configurar ejes
-        ax.set_xlim([-1, 1])
-        ax.set_ylim([-1, 1])
-        ax.set_zlim([-1, 1])
-        ax.set_xlabel('X')
-        ax.set_ylabel('Y')
-        ax.set_zlabel('Z')
-        ax.set_title(f'{name}\nBloch: ({bloch_vec[0]:.2f}, {bloch_vec[1]:.2f}, {bloch_vec[2]:.2f})')
+        # Malla de la esfera calculada una sola vez
+        x_sphere, y_sphere, z_sphere = sphere_mesh()
         
-        # Información del estado
-        purity = np.real(np.trace(rho_0.data @ rho_0.data)) if i == 0 else \
-                np.real(np.trace(rho_1.data @ rho_1.data)) if i == 1 else \
-                np.real(np.trace(rho_2.data @ rho_2.data))
+        for i, (bloch_vec, name) in enumerate(zip(bloch_vectors, qubit_names)):
+            ax = axes[i]
+            
+            # Dibujar esfera
+            ax.plot_surface(x_sphere, y_sphere, z_sphere, alpha=0.1, color='lightblue')
+            
+            # Dibujar vector de Bloch
+            ax.quiver(0, 0, 0, bloch_vec[0], bloch_vec[1], bloch_vec[2], 
+                     color='red', arrow_length_ratio=0.1, linewidth=3)
+            
+            # Configurar ejes
+            ax.set_xlim([-1, 1])
+            ax.set_ylim([-1, 1])
+            ax.set_zlim([-1, 1])
+            ax.set_xlabel('X')
+            ax.set_ylabel('Y')
+            ax.set_zlabel('Z')
+            ax.set_title(f'{name}\nBloch: ({bloch_vec[0]:.2f}, {bloch_vec[1]:.2f}, {bloch_vec[2]:.2f})')
         
-        print(f"   • {name}: Pureza = {purity:.3f}")
-    
-    plt.suptitle("🧠 Esferas de Bloch - Estados de Protofilamentos", fontsize=14)
-    plt.tight_layout()
-    plt.show()
+        plt.suptitle("🧠 Esferas de Bloch - Estados de Protofilamentos", fontsize=14)
+        plt.tight_layout()
+        plt.show()
     
 except Exception as e:
     print(f"Error en esferas de Bloch: {e}")
@@ -206,18 +163,24 @@ try:
     # Q-Sphere para el estado completo
     print("Generando Q-Sphere del estado cuántico completo...")
     
-    plt.figure(figsize=(12, 4))
-    
-    # Q-Sphere del estado final
-    
-    plot_state_qsphere(state_final)
-    
-    # Q-Sphere del estado entrelazado (sin rotaciones)
-    
-    plot_state_qsphere(state_entangled)
-    
-    
-    plt.show()
+    if figures_dir is not None:
+        save_figure(qsphere_figure(state_final, title="Estado Final"),
+                    figures_dir / "qsphere_final", FIGURE_FORMATS)
+        save_figure(qsphere_figure(state_entangled, title="Estado Entrelazado"),
+                    figures_dir / "qsphere_entrelazado", FIGURE_FORMATS)
+    else:
+        plt.figure(figsize=(12, 4))
+        
+        # Q-Sphere del estado final
+        
+        plot_state_qsphere(state_final)
+        
+        # Q-Sphere del estado entrelazado (sin rotaciones)
+        
+        plot_state_qsphere(state_entangled)
+        
+        
+        plt.show()
     
 except Exception as e:
     print(f"Q-Sphere no disponible: {e}")
@@ -230,22 +193,28 @@ print("\n4️⃣ CITY PLOT - PAISAJE DE PROBABILIDADES")
 print("=" * 40)
 
 try:
-    plt.figure(figsize=(15, 5))
-    
-    # City plot del estado inicial
-    
-    plot_state_city(state_init, title="Estado Inicial")
-    
-    # City plot del estado con superposición
-    
-    plot_state_city(state_super, title="Con Superposición")
-    
-    # City plot del estado final
-    
-    plot_state_city(state_final, title="Estado Final Orch-OR")
-    
-    plt.tight_layout()
-    plt.show()
+    if figures_dir is not None:
+        save_figure(city_figure({"Estado Inicial": state_init,
+                                 "Con Superposición": state_super,
+                                 "Estado Final Orch-OR": state_final}),
+                    figures_dir / "city", FIGURE_FORMATS)
+    else:
+        plt.figure(figsize=(15, 5))
+        
+        # City plot del estado inicial
+        
+        plot_state_city(state_init, title="Estado Inicial")
+        
+        # City plot del estado con superposición
+        
+        plot_state_city(state_super, title="Con Superposición")
+        
+        # City plot del estado final
+        
+        plot_state_city(state_final, title="Estado Final Orch-OR")
+        
+        plt.tight_layout()
+        plt.show()
     
 except Exception as e:
     print(f"City plot no disponible: {e}")
@@ -265,21 +234,9 @@ try:
     pairs = [(0, 1), (1, 2), (0, 2)]
     
     for pair in pairs:
-        try:
-            # Obtener estado reducido del par
-            other_qubits = [i for i in range(3) if i not in pair]
-            if len(other_qubits) == 1:
-                rho_pair = partial_trace(state_final, other_qubits)
-                
-                # Calcular entrelazamiento (entropía de entrelazamiento)
-                eigenvals = np.linalg.eigvals(rho_pair.data)
-                eigenvals = eigenvals[eigenvals > 1e-12]  # Filtrar valores muy pequeños
-                entanglement = -np.sum(eigenvals * np.log2(eigenvals + 1e-12))
-                
-                print(f"   • Entrelazamiento qubits {pair}: {entanglement:.3f} ebits")
-                
-        except Exception as e:
-            print(f"   • Error calculando entrelazamiento {pair}: {e}")
+        # Entropía de von Neumann del estado reducido del par
+        entanglement = final_metrics["pair_entropy"][pair]
+        print(f"   • Entrelazamiento qubits {pair}: {entanglement:.3f} ebits")
             
 except Exception as e:
     print(f"Error en análisis de entrelazamiento: {e}")
@@ -300,21 +257,26 @@ for i, (state, label) in enumerate(zip(states, state_labels)):
     evolution_data.append(probs)
 
 # Graficar evolución
-plt.figure(figsize=(12, 8))
-
-# Gráfico de barras apiladas para mostrar evolución
-for i, probs in enumerate(evolution_data):
-    plt.subplot(2, 3, i+1)
-    plt.bar(range(len(probs)), probs, alpha=0.7)
-    plt.title(f'{time_steps[i]}')
-    plt.xlabel('Estado |ijk⟩')
-    plt.ylabel('Probabilidad')
-    plt.xticks(range(min(8, len(probs))), [f'|{i:03b}⟩' for i in range(min(8, len(probs)))])
-    plt.xticks(rotation=45)
-
-plt.suptitle('🕒 Evolución Temporal del Estado Cuántico Orch-OR', fontsize=14)
-plt.tight_layout()
-plt.show()
+if figures_dir is not None:
+    save_figure(evolution_figure(dict(zip(time_steps, states)),
+                                 title='🕒 Evolución Temporal del Estado Cuántico Orch-OR'),
+                figures_dir / "evolucion", FIGURE_FORMATS)
+else:
+    plt.figure(figsize=(12, 8))
+
+    # Gráfico de barras apiladas para mostrar evolución
+    for i, probs in enumerate(evolution_data):
+        plt.subplot(2, 3, i+1)
+        plt.bar(range(len(probs)), probs, alpha=0.7)
+        plt.title(f'{time_steps[i]}')
+        plt.xlabel('Estado |ijk⟩')
+        plt.ylabel('Probabilidad')
+        plt.xticks(range(min(8, len(probs))), [f'|{i:03b}⟩' for i in range(min(8, len(probs)))])
+        plt.xticks(rotation=45)
+
+    plt.suptitle('🕒 Evolución Temporal del Estado Cuántico Orch-OR', fontsize=14)
+    plt.tight_layout()
+    plt.show()
 
 # =============================================================================
 # 7. RESUMEN EJECUTIVO